@@ -22,16 +22,51 @@ Example usage:
 """
 
 import asyncio
+import concurrent.futures
+import contextlib
+import math
+import os
+import threading
 from decimal import Decimal
+from functools import lru_cache
 from typing import Dict, List, Optional, Union
 
-from claude_mm.cache import cache_response, get_cached_response
-from claude_mm.config import load_config
+from claude_mm.cache import cache_response, get_cache_key, get_cached_response
+from claude_mm.config import DEFAULT_CONFIG, load_config
 from claude_mm.models import normalize_model_name
-from claude_mm.providers import get_provider
-from claude_mm.providers.base import ProviderResponse
+from claude_mm.providers import Provider, get_provider
+from claude_mm.providers._http import aclose_async_http
+from claude_mm.providers.base import PICODOLLARS_PER_DOLLAR, ProviderResponse
 from claude_mm.usage import log_api_call
 
+# Background event loop used when the sync API is called from inside a running loop
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_lock = threading.Lock()
+
+# Single-flight maps: identical concurrent cache misses share one provider call.
+# Sync callers wait on a Future keyed by cache key; async callers await the task
+# already running on their event loop.
+_INFLIGHT: Dict[str, concurrent.futures.Future] = {}
+_inflight_lock = threading.Lock()
+_INFLIGHT_ASYNC: Dict[tuple, asyncio.Task] = {}
+
+# Review system prompts by focus (shared by review() and review_async())
+_SYSTEM_PROMPTS = {
+    "general": "You are an expert code reviewer. Provide thorough, actionable feedback.",
+    "security": (
+        "You are a security expert. Focus on security vulnerabilities, "
+        "input validation, and potential exploits."
+    ),
+    "performance": (
+        "You are a performance expert. Focus on optimization opportunities, "
+        "algorithmic efficiency, and resource usage."
+    ),
+    "architecture": (
+        "You are a software architect. Focus on design patterns, modularity, "
+        "and long-term maintainability."
+    ),
+}
+
 
 class ReviewResult:
     """Result from a review operation."""
@@ -41,19 +76,31 @@ class ReviewResult:
         self.model = response.model
         self.input_tokens = response.input_tokens
         self.output_tokens = response.output_tokens
-        self.cost = response.cost
+        # Float internally; Decimal only when formatting for display
+        if response.cost_picodollars is not None:
+            self.cost = response.cost_picodollars / PICODOLLARS_PER_DOLLAR
+        else:
+            self.cost = float(response.cost or 0.0)
         self.cached = cached
 
     def __str__(self):
         return self.text
 
+    def format_cost(self, places: int = 4) -> str:
+        """Format the cost as a dollar amount (e.g. '$0.0123')."""
+        return _format_cost(self.cost, places)
+
 
 class MultiReviewResult:
     """Result from a multi-model review."""
 
     def __init__(self, results: Dict[str, ReviewResult]):
         self.results = results
-        self.total_cost = sum(r.cost for r in results.values() if r.cost)
+        self.total_cost = math.fsum(r.cost for r in results.values())
+
+    def format_cost(self, places: int = 4) -> str:
+        """Format the total cost as a dollar amount (e.g. '$0.0123')."""
+        return _format_cost(self.total_cost, places)
 
     def __getitem__(self, model: str) -> ReviewResult:
         return self.results[model]
@@ -62,6 +109,38 @@ class MultiReviewResult:
         return iter(self.results.items())
 
 
+def _format_cost(cost: float, places: int) -> str:
+    """Internal: Round a float cost exactly for display."""
+    return f"${Decimal(str(cost)).quantize(Decimal(1).scaleb(-places))}"
+
+
+def _resolve_models(
+    model: Optional[str], models: Optional[List[str]], config: dict
+) -> List[str]:
+    """Internal: Determine which models a review should use."""
+    if models:
+        return models
+    if model:
+        return [model]
+    # Default to configured review model
+    return [config.get("default_models", {}).get("review", "gpt-5.2-chat-latest")]
+
+
+def _max_concurrent(config: dict) -> int:
+    """
+    Internal: Cap on in-flight provider calls (CLAUDE_MM_MAX_CONC overrides config).
+
+    Values that aren't integers fall back to the default, and the cap is at least 1
+    (a semaphore of 0 would block every review forever).
+    """
+    value = os.environ.get("CLAUDE_MM_MAX_CONC", config.get("max_concurrent"))
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = DEFAULT_CONFIG["max_concurrent"]
+    return max(1, value)
+
+
 def review(
     prompt: str,
     model: Optional[str] = None,
@@ -93,33 +172,8 @@ def review(
         ...     print(f"{model}: {result.text}")
     """
     config = load_config()
-
-    # Determine which models to use
-    if models:
-        model_list = models
-    elif model:
-        model_list = [model]
-    else:
-        # Default to configured review model
-        model_list = [config.get("default_models", {}).get("review", "gpt-5.2-chat-latest")]
-
-    # Build system prompt based on focus
-    system_prompts = {
-        "general": "You are an expert code reviewer. Provide thorough, actionable feedback.",
-        "security": (
-            "You are a security expert. Focus on security vulnerabilities, "
-            "input validation, and potential exploits."
-        ),
-        "performance": (
-            "You are a performance expert. Focus on optimization opportunities, "
-            "algorithmic efficiency, and resource usage."
-        ),
-        "architecture": (
-            "You are a software architect. Focus on design patterns, modularity, "
-            "and long-term maintainability."
-        ),
-    }
-    system_prompt = system_prompts.get(focus, system_prompts["general"])
+    model_list = _resolve_models(model, models, config)
+    system_prompt = _SYSTEM_PROMPTS.get(focus, _SYSTEM_PROMPTS["general"])
 
     # Single model review
     if len(model_list) == 1:
@@ -138,6 +192,7 @@ def review(
         system_prompt,
         use_cache,
         cache_ttl or config.get("cache_ttl_hours", 24),
+        _max_concurrent(config),
     )
 
 
@@ -149,33 +204,53 @@ def _review_single(
     cache_ttl: int,
 ) -> ReviewResult:
     """Internal: Single model review."""
-    # Check cache first
-    if use_cache:
-        cached = get_cached_response(model, prompt, system_prompt, ttl_hours=cache_ttl)
-        if cached:
-            return ReviewResult(
-                ProviderResponse(
-                    text=cached,
-                    model=model,
-                    input_tokens=0,
-                    output_tokens=0,
-                    cost=Decimal("0"),
-                    cached=True,
-                ),
-                cached=True,
-            )
+    if not use_cache:
+        return _complete(prompt, model, system_prompt, use_cache)
 
+    # Check cache first
+    cached = get_cached_response(model, prompt, system_prompt, ttl_hours=cache_ttl)
+    if cached:
+        return _cached_result(model, cached)
+
+    # Share the response of an identical request already in flight on another thread
+    cache_key = get_cache_key(model, prompt, system_prompt)
+    with _inflight_lock:
+        future = _INFLIGHT.get(cache_key)
+        leader = future is None
+        if leader:
+            future = concurrent.futures.Future()
+            _INFLIGHT[cache_key] = future
+
+    if not leader:
+        return _cached_result(model, future.result())
+
+    try:
+        result = _complete(prompt, model, system_prompt, use_cache)
+        future.set_result(result.text)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _INFLIGHT[cache_key]
+
+
+def _complete(prompt: str, model: str, system_prompt: str, use_cache: bool) -> ReviewResult:
+    """Internal: Call the provider, then log usage and cache the response."""
     # Get provider and call
     provider_name, model_id = normalize_model_name(model)
-    provider = get_provider(provider_name)
+    provider = _get_default_provider(provider_name)
     response = provider.complete(prompt, model_id, system_prompt)
 
+    result = ReviewResult(response, cached=False)
+
     # Log usage
     log_api_call(
         model=model_id,
         input_tokens=response.input_tokens,
         output_tokens=response.output_tokens,
-        cost=float(response.cost) if response.cost else 0.0,
+        cost=result.cost,
         operation="review",
     )
 
@@ -183,7 +258,28 @@ def _review_single(
     if use_cache:
         cache_response(model, prompt, response.text, system_prompt)
 
-    return ReviewResult(response, cached=False)
+    return result
+
+
+@lru_cache(maxsize=None)
+def _get_default_provider(name: str) -> Provider:
+    """Internal: Get the shared default-configured provider (reusing its SDK clients)."""
+    return get_provider(name)
+
+
+def _cached_result(model: str, text: str) -> ReviewResult:
+    """Internal: Wrap a response that cost nothing (cache hit or shared in-flight call)."""
+    return ReviewResult(
+        ProviderResponse(
+            text=text,
+            model=model,
+            input_tokens=0,
+            output_tokens=0,
+            cost=Decimal("0"),
+            cached=True,
+        ),
+        cached=True,
+    )
 
 
 def _review_multi(
@@ -192,33 +288,46 @@ def _review_multi(
     system_prompt: str,
     use_cache: bool,
     cache_ttl: int,
+    max_concurrent: int = 8,
 ) -> MultiReviewResult:
-    """Internal: Multi-model review using asyncio."""
-    # For now, use threading for backward compatibility
-    # TODO: Switch to pure asyncio in future
-    import threading
+    """Internal: Multi-model review on a shared asyncio event loop."""
+    coro = _review_multi_async(
+        prompt, models, system_prompt, use_cache, cache_ttl, max_concurrent
+    )
 
-    results = {}
-    errors = {}
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop running (CLI, plain scripts) - run the fan-out directly
+        return asyncio.run(_closing_http(coro))
 
-    def review_thread(model_name):
-        try:
-            result = _review_single(prompt, model_name, system_prompt, use_cache, cache_ttl)
-            results[model_name] = result
-        except Exception as e:
-            errors[model_name] = str(e)
+    # Called from inside a running loop (e.g. Jupyter, editor integrations).
+    # asyncio.run() would fail here, so hand the fan-out to a background loop.
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
 
-    threads = [threading.Thread(target=review_thread, args=(m,)) for m in models]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
 
-    if errors:
-        for model, error in errors.items():
-            print(f"Error reviewing with {model}: {error}")
+async def _closing_http(coro):
+    """Internal: Await coro, then close the loop's shared HTTP pool before it exits."""
+    try:
+        return await coro
+    finally:
+        await aclose_async_http()
 
-    return MultiReviewResult(results)
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Internal: Get (or lazily start) the shared background event loop."""
+    global _background_loop
+
+    with _background_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="claude-mm-loop", daemon=True
+            )
+            thread.start()
+            _background_loop = loop
+
+    return _background_loop
 
 
 def plan(
@@ -311,25 +420,8 @@ async def review_async(
 ) -> Union[ReviewResult, MultiReviewResult]:
     """Async version of review(). See review() for documentation."""
     config = load_config()
-
-    # Determine which models to use
-    if models:
-        model_list = models
-    elif model:
-        model_list = [model]
-    else:
-        model_list = [config.get("default_models", {}).get("review", "gpt-5.2-chat-latest")]
-
-    # Build system prompt
-    system_prompts = {
-        "general": "You are an expert code reviewer. Provide thorough, actionable feedback.",
-        "security": "You are a security expert. Focus on security vulnerabilities.",
-        "performance": "You are a performance expert. Focus on optimization opportunities.",
-        "architecture": (
-            "You are a software architect. Focus on design patterns and maintainability."
-        ),
-    }
-    system_prompt = system_prompts.get(focus, system_prompts["general"])
+    model_list = _resolve_models(model, models, config)
+    system_prompt = _SYSTEM_PROMPTS.get(focus, _SYSTEM_PROMPTS["general"])
 
     # Single model
     if len(model_list) == 1:
@@ -342,25 +434,41 @@ async def review_async(
         )
 
     # Multi-model (parallel with asyncio)
+    return await _review_multi_async(
+        prompt,
+        model_list,
+        system_prompt,
+        use_cache,
+        cache_ttl or config.get("cache_ttl_hours", 24),
+        _max_concurrent(config),
+    )
+
+
+async def _review_multi_async(
+    prompt: str,
+    models: List[str],
+    system_prompt: str,
+    use_cache: bool,
+    cache_ttl: int,
+    max_concurrent: int = 8,
+) -> MultiReviewResult:
+    """Internal: Fan out a review to several models concurrently."""
+    # Bound in-flight provider calls to stay under provider rate limits
+    semaphore = asyncio.Semaphore(max_concurrent)
+
     tasks = [
-        _review_single_async(
-            prompt,
-            m,
-            system_prompt,
-            use_cache,
-            cache_ttl or config.get("cache_ttl_hours", 24),
-        )
-        for m in model_list
+        _review_single_async(prompt, m, system_prompt, use_cache, cache_ttl, semaphore)
+        for m in models
     ]
     results_list = await asyncio.gather(*tasks, return_exceptions=True)
 
     # Build results dict
     results = {}
-    for i, model_name in enumerate(model_list):
-        if isinstance(results_list[i], Exception):
-            print(f"Error reviewing with {model_name}: {results_list[i]}")
+    for model_name, result in zip(models, results_list):
+        if isinstance(result, Exception):
+            print(f"Error reviewing with {model_name}: {result}")
         else:
-            results[model_name] = results_list[i]
+            results[model_name] = result
 
     return MultiReviewResult(results)
 
@@ -371,40 +479,61 @@ async def _review_single_async(
     system_prompt: str,
     use_cache: bool,
     cache_ttl: int,
+    semaphore: Optional[asyncio.Semaphore] = None,
 ) -> ReviewResult:
     """Internal: Async single model review."""
+    if not use_cache:
+        return await _complete_async(prompt, model, system_prompt, use_cache, semaphore)
+
     # Check cache first (sync operation)
-    if use_cache:
-        cached = get_cached_response(model, prompt, system_prompt, ttl_hours=cache_ttl)
-        if cached:
-            return ReviewResult(
-                ProviderResponse(
-                    text=cached,
-                    model=model,
-                    input_tokens=0,
-                    output_tokens=0,
-                    cost=Decimal("0"),
-                    cached=True,
-                ),
-                cached=True,
-            )
+    cached = get_cached_response(model, prompt, system_prompt, ttl_hours=cache_ttl)
+    if cached:
+        return _cached_result(model, cached)
+
+    # Await an identical request already in flight on this loop instead of repeating it
+    loop = asyncio.get_running_loop()
+    inflight_key = (loop, get_cache_key(model, prompt, system_prompt))
+    task = _INFLIGHT_ASYNC.get(inflight_key)
+    if task is not None:
+        # Shielded so a cancelled follower doesn't cancel the shared call
+        result = await asyncio.shield(task)
+        return _cached_result(model, result.text)
+
+    task = loop.create_task(
+        _complete_async(prompt, model, system_prompt, use_cache, semaphore)
+    )
+    _INFLIGHT_ASYNC[inflight_key] = task
+    task.add_done_callback(lambda _: _INFLIGHT_ASYNC.pop(inflight_key, None))
+    return await task
+
 
+async def _complete_async(
+    prompt: str,
+    model: str,
+    system_prompt: str,
+    use_cache: bool,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> ReviewResult:
+    """Internal: Call the provider asynchronously, then log usage and cache the response."""
     # Get provider and call async
     provider_name, model_id = normalize_model_name(model)
-    provider = get_provider(provider_name)
-    response = await provider.complete_async(prompt, model_id, system_prompt)
+    provider = _get_default_provider(provider_name)
+    async with semaphore or contextlib.nullcontext():
+        response = await provider.complete_async(prompt, model_id, system_prompt)
 
-    # Log usage (sync operation)
+    result = ReviewResult(response, cached=False)
+
+    # Log usage (queued for the background writer, so this doesn't block)
     log_api_call(
         model=model_id,
         input_tokens=response.input_tokens,
         output_tokens=response.output_tokens,
-        cost=float(response.cost) if response.cost else 0.0,
+        cost=result.cost,
         operation="review",
     )
 
-    # Cache response (sync operation)
+    # Cache response in a worker thread so the disk write doesn't stall other reviews
     if use_cache:
-        cache_response(model, prompt, response.text, system_prompt)
+        await asyncio.to_thread(cache_response, model, prompt, response.text, system_prompt)
 
-    return ReviewResult(response, cached=False)
+    return result
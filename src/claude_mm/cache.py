@@ -2,28 +2,274 @@
 """
 Response caching for AI API calls.
 
-Provides disk-based caching with TTL support and atomic writes to prevent race conditions.
+Responses are stored in a single SQLite database (WAL mode) with TTL support, so a
+lookup is one indexed row read and stats/clear are single queries. Hot entries are
+also kept in a small in-process LRU (L1) so repeat lookups skip the database.
+
+Large responses are zstd-compressed when the optional speedups are installed
+(pip install claude-mm-tool[fast]).
 """
 
 import hashlib
-import json
+import logging
 import os
-import tempfile
-from datetime import datetime, timedelta
+import random
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
 from pathlib import Path
 
+from claude_mm.config import load_config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Trailing spaces/tabs at the end of each line
+_TRAILING_WS_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+# Responses larger than this (in bytes) are compressed when zstandard is available
+_COMPRESS_MIN_BYTES = 4096
+_ZSTD_LOCAL = threading.local()
+
+# In-process L1 cache: cache_key -> (cached_at epoch seconds, response)
+_L1: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+_L1_MAX_ENTRIES = 1024
+_L1_LOCK = threading.Lock()
+
+# Created cache directories by home directory, so mkdir runs once per process
+_CACHE_DIRS: "dict[Path, Path]" = {}
+
+# Open database connections, keyed by database path. Connections are shared between
+# threads, so every query runs under _DB_LOCK.
+_DB: "dict[Path, sqlite3.Connection]" = {}
+_DB_LOCK = threading.Lock()
+
+# Bloom filters of the keys stored in each database, keyed by database path, so most
+# misses are answered without a query. 2^23 bits (1 MiB) with 3 probes stays under
+# ~0.1% false positives up to about 10^5 entries. Guarded by _DB_LOCK.
+_BLOOMS: "dict[Path, bytearray]" = {}
+_BLOOM_BITS = 1 << 23
+_BLOOM_MASK = _BLOOM_BITS - 1
+
+# When each bloom filter last caught up with the database: (PRAGMA data_version, epoch
+# seconds). data_version changes when another connection (e.g. another process)
+# commits; the filter then adds keys written since, by timestamp, with a margin for
+# writers that committed a while after taking their timestamp. Guarded by _DB_LOCK.
+_BLOOM_SYNC: "dict[Path, tuple[int, float]]" = {}
+_BLOOM_SYNC_MARGIN = 60
+
+# Expired rows are skipped by the read query rather than deleted on read; a database
+# miss sweeps them out with this probability
+_SWEEP_PROBABILITY = 0.01
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    ts REAL NOT NULL,
+    model TEXT,
+    response BLOB
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_ts ON cache(ts);
+"""
+
+
+def _l1_get(cache_key: str, ttl_hours: int):
+    """Look up a response in the L1 cache, dropping it if expired."""
+    with _L1_LOCK:
+        entry = _L1.get(cache_key)
+        if entry is None:
+            return None
+
+        cached_at, response = entry
+        if time.time() - cached_at > ttl_hours * 3600:
+            del _L1[cache_key]
+            return None
+
+        _L1.move_to_end(cache_key)
+        return response
+
+
+def _l1_put(cache_key: str, cached_at: float, response: str) -> None:
+    """Insert a response into the L1 cache, evicting the least recently used entry."""
+    with _L1_LOCK:
+        _L1[cache_key] = (cached_at, response)
+        _L1.move_to_end(cache_key)
+        if len(_L1) > _L1_MAX_ENTRIES:
+            _L1.popitem(last=False)
+
+
+def _l1_discard(cache_key: str = None) -> None:
+    """Remove one entry (or all entries) from the L1 cache."""
+    with _L1_LOCK:
+        if cache_key is None:
+            _L1.clear()
+        else:
+            _L1.pop(cache_key, None)
+
+
+def _zstd():
+    """Get this thread's (compressor, decompressor) pair, creating it on first use."""
+    # zstandard contexts are reusable but not thread-safe, so keep one pair per thread
+    pair = getattr(_ZSTD_LOCAL, "pair", None)
+    if pair is None:
+        pair = (zstandard.ZstdCompressor(level=3), zstandard.ZstdDecompressor())
+        _ZSTD_LOCAL.pair = pair
+    return pair
+
+
+def _encode_response(response: str):
+    """Encode a response for storage: TEXT as-is, or a zstd BLOB for large responses."""
+    data = response.encode()
+    if zstandard is not None and len(data) > _COMPRESS_MIN_BYTES:
+        return _zstd()[0].compress(data)
+    return response
+
+
+def _decode_response(stored) -> str:
+    """Decode a stored response (BLOBs are always zstd-compressed)."""
+    if isinstance(stored, str):
+        return stored
+    # Compressed entries need zstandard; without it this raises and reads as a miss
+    return _zstd()[1].decompress(stored).decode()
+
 
 def get_cache_dir() -> Path:
-    """Get the cache directory path."""
-    cache_dir = Path.home() / ".config" / "claude-mm-tool" / "cache"
-    cache_dir.mkdir(parents=True, exist_ok=True)
+    """Get the cache directory path, creating it the first time it is used."""
+    home = Path.home()
+    cache_dir = _CACHE_DIRS.get(home)
+    if cache_dir is None:
+        cache_dir = home / ".config" / "claude-mm-tool" / "cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _CACHE_DIRS[home] = cache_dir
     return cache_dir
 
 
-def get_cache_key(model: str, prompt: str, system_prompt: str = None) -> str:
-    """Generate a cache key from model and prompts."""
-    content = f"{model}:{system_prompt or ''}:{prompt}"
-    return hashlib.sha256(content.encode()).hexdigest()
+def _bloom_positions(cache_key: str):
+    """Bit positions for a key. Keys are already uniform hex digests, so slice them."""
+    return (
+        int(cache_key[0:8], 16) & _BLOOM_MASK,
+        int(cache_key[8:16], 16) & _BLOOM_MASK,
+        int(cache_key[16:24], 16) & _BLOOM_MASK,
+    )
+
+
+def _bloom_add(bloom: bytearray, cache_key: str) -> None:
+    """Record a key in a bloom filter."""
+    for pos in _bloom_positions(cache_key):
+        bloom[pos >> 3] |= 1 << (pos & 7)
+
+
+def _bloom_maybe(bloom: bytearray, cache_key: str) -> bool:
+    """Check whether a key may be in a bloom filter (False means definitely absent)."""
+    return all(bloom[pos >> 3] & (1 << (pos & 7)) for pos in _bloom_positions(cache_key))
+
+
+def _connect(cache_dir: Path) -> sqlite3.Connection:
+    """Get the (lazily opened) cache database connection for a cache directory."""
+    db_path = cache_dir / "cache.sqlite"
+    with _DB_LOCK:
+        conn = _DB.get(db_path)
+        if conn is None:
+            # Autocommit: every statement is its own short transaction
+            conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            if load_config().get("cache_fsync", False):
+                conn.execute("PRAGMA synchronous=FULL")
+            else:
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.executescript(_SCHEMA)
+
+            bloom = bytearray(_BLOOM_BITS // 8)
+            _BLOOM_SYNC[db_path] = (_data_version(conn), time.time())
+            for (key,) in conn.execute("SELECT key FROM cache"):
+                _bloom_add(bloom, key)
+            _BLOOMS[db_path] = bloom
+            _DB[db_path] = conn
+        return conn
+
+
+def _data_version(conn: sqlite3.Connection) -> int:
+    """Get the database's data version, which changes on other connections' commits."""
+    return conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def _synced_bloom(conn: sqlite3.Connection, db_path: Path) -> bytearray:
+    """Get a database's bloom filter, first adding keys other processes have written."""
+    bloom = _BLOOMS[db_path]
+    version = _data_version(conn)
+    synced_version, synced_ts = _BLOOM_SYNC[db_path]
+    if version != synced_version:
+        now = time.time()
+        for (key,) in conn.execute(
+            "SELECT key FROM cache WHERE ts >= ?", (synced_ts - _BLOOM_SYNC_MARGIN,)
+        ):
+            _bloom_add(bloom, key)
+        _BLOOM_SYNC[db_path] = (version, now)
+    return bloom
+
+
+def _normalize(prompt: str) -> str:
+    """
+    Normalize a prompt so trivially different inputs share a cache key.
+
+    Only changes that cannot alter meaning are applied: line endings, trailing
+    whitespace on each line, and leading/trailing blank space. Indentation and
+    case are preserved since both are significant in code.
+    """
+    return _TRAILING_WS_RE.sub("", prompt.replace("\r\n", "\n").strip())
+
+
+def get_cache_key(
+    model: str, prompt: str, system_prompt: str = None, normalize: bool = None
+) -> str:
+    """
+    Generate a cache key from model and prompts.
+
+    Args:
+        model: Model name
+        prompt: User prompt
+        system_prompt: System prompt (optional)
+        normalize: Normalize whitespace in the prompt before hashing
+            (default: the normalize_cache_key config setting)
+    """
+    if normalize is None:
+        normalize = load_config().get("normalize_cache_key", True)
+    if normalize:
+        prompt = _normalize(prompt)
+
+    # BLAKE2b: keys are only used for lookups, and it is faster than SHA-256.
+    # Parts are fed to the hasher separately to avoid building one large string.
+    h = hashlib.blake2b(digest_size=32)
+    h.update(model.encode())
+    h.update(b":")
+    h.update((system_prompt or "").encode())
+    h.update(b":")
+    h.update(prompt.encode())
+    return h.hexdigest()
+
+
+def _should_cache(prompt: str) -> bool:
+    """
+    Check whether a prompt is worth caching.
+
+    Tiny prompts are cheap to re-run and rarely repeated verbatim, and huge ones
+    (whole conversations or files) are rarely reused but bloat the cache.
+    """
+    config = load_config()
+    return (
+        config.get("cache_min_chars", 64)
+        <= len(prompt)
+        <= config.get("cache_max_chars", 200_000)
+    )
 
 
 def get_cached_response(
@@ -41,33 +287,94 @@ def get_cached_response(
     Returns:
         Cached response text or None if not found/expired
     """
-    cache_dir = get_cache_dir()
+    if not _should_cache(prompt):
+        return None
+
     cache_key = get_cache_key(model, prompt, system_prompt)
-    cache_file = cache_dir / f"{cache_key}.json"
 
-    if not cache_file.exists():
-        return None
+    # L1: in-process memory
+    cached = _l1_get(cache_key, ttl_hours)
+    if cached is not None:
+        return cached
 
-    try:
-        with open(cache_file) as f:
-            cache_data = json.load(f)
-
-        # Check if expired
-        cached_at = datetime.fromisoformat(cache_data["timestamp"])
-        if datetime.now() - cached_at > timedelta(hours=ttl_hours):
-            # Expired, remove cache file
-            cache_file.unlink()
-            return None
+    # L2: SQLite
+    cache_dir = get_cache_dir()
+    response = _read_entry(cache_dir, cache_key, ttl_hours)
+    if response is not None:
+        return response
 
-        return cache_data["response"]
+    # Optional L3: a semantically similar earlier prompt
+    return _semantic_lookup(cache_dir, model, prompt, system_prompt, ttl_hours)
+
+
+def _read_entry(cache_dir: Path, cache_key: str, ttl_hours: int):
+    """Read a response from the database, filling the L1 cache on a hit."""
+    try:
+        conn = _connect(cache_dir)
+        cutoff_ts = time.time() - ttl_hours * 3600
+        with _DB_LOCK:
+            bloom = _synced_bloom(conn, cache_dir / "cache.sqlite")
+            if not _bloom_maybe(bloom, cache_key):
+                return None
+
+            row = conn.execute(
+                "SELECT ts, response FROM cache WHERE key = ? AND ts >= ?",
+                (cache_key, cutoff_ts),
+            ).fetchone()
+            if row is None:
+                if random.random() < _SWEEP_PROBABILITY:
+                    # Sweep with the configured TTL, not this caller's: a short-TTL
+                    # lookup mustn't delete entries longer-TTL callers can still use
+                    sweep_hours = max(ttl_hours, load_config().get("cache_ttl_hours", 24))
+                    conn.execute(
+                        "DELETE FROM cache WHERE ts < ?", (time.time() - sweep_hours * 3600,)
+                    )
+                return None
+
+        cached_at, stored = row
+        response = _decode_response(stored)
+        _l1_put(cache_key, cached_at, response)
+        return response
     except Exception:
         # If cache read fails, ignore and return None
         return None
 
 
+def _semantic_enabled(config: dict) -> bool:
+    """Check whether the semantic cache tier is configured and installed."""
+    if not config.get("semantic_cache", False):
+        return False
+
+    # Only imported when configured; the module loads its heavy dependencies lazily too
+    from claude_mm import semantic_cache
+
+    return semantic_cache.is_available()
+
+
+def _semantic_lookup(cache_dir: Path, model: str, prompt: str, system_prompt: str, ttl_hours: int):
+    """Look up the response cached for a semantically similar prompt."""
+    config = load_config()
+    if not _semantic_enabled(config):
+        return None
+
+    from claude_mm import semantic_cache
+
+    try:
+        match_key = semantic_cache.lookup(
+            cache_dir, model, prompt, system_prompt, config.get("semantic_threshold", 0.92)
+        )
+    except Exception:
+        # Semantic lookup is best-effort; fall back to a miss
+        return None
+
+    if match_key is None:
+        return None
+    return _read_entry(cache_dir, match_key, ttl_hours)
+
+
 def cache_response(model: str, prompt: str, response: str, system_prompt: str = None) -> None:
     """
-    Cache an API response using atomic write to prevent race conditions.
+    Cache an API response.
 
     Args:
         model: Model name
@@ -75,40 +382,33 @@ def cache_response(model: str, prompt: str, response: str, system_prompt: str =
         response: API response text
         system_prompt: System prompt (optional)
     """
+    if not _should_cache(prompt):
+        return
+
     cache_dir = get_cache_dir()
     cache_key = get_cache_key(model, prompt, system_prompt)
-    cache_file = cache_dir / f"{cache_key}.json"
 
-    cache_data = {
-        "timestamp": datetime.now().isoformat(),
-        "model": model,
-        "response": response,
-    }
+    now = time.time()
+    _l1_put(cache_key, now, response)
 
     try:
-        # Use atomic write: write to temp file, then rename
-        # This prevents corruption if multiple processes write simultaneously
-        with tempfile.NamedTemporaryFile(
-            mode='w',
-            dir=cache_dir,
-            delete=False,
-            suffix='.tmp'
-        ) as tmp_file:
-            json.dump(cache_data, tmp_file)
-            tmp_path = tmp_file.name
-
-        # Atomic rename (replaces existing file if present)
-        os.replace(tmp_path, cache_file)
+        # A single INSERT is atomic, so concurrent writers can't leave a partial entry
+        conn = _connect(cache_dir)
+        with _DB_LOCK:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, ts, model, response) VALUES (?, ?, ?, ?)",
+                (cache_key, now, model, _encode_response(response)),
+            )
+            _bloom_add(_BLOOMS[cache_dir / "cache.sqlite"], cache_key)
+
+        config = load_config()
+        if _semantic_enabled(config):
+            from claude_mm import semantic_cache
+
+            semantic_cache.add(cache_dir, model, prompt, cache_key, system_prompt)
     except Exception as e:
         # Don't fail the operation if caching fails
-        import sys
-        print(f"Warning: Failed to cache response: {e}", file=sys.stderr)
-        # Clean up temp file if it exists
-        try:
-            if 'tmp_path' in locals():
-                Path(tmp_path).unlink(missing_ok=True)
-        except Exception:
-            pass
+        logger.warning("Failed to cache response: %s", e)
 
 
 def clear_cache(older_than_hours: int = None) -> int:
@@ -119,34 +419,45 @@ def clear_cache(older_than_hours: int = None) -> int:
         older_than_hours: Only clear cache older than N hours (None = all)
 
     Returns:
-        Number of cache files removed
+        Number of cache entries removed
     """
     cache_dir = get_cache_dir()
     if not cache_dir.exists():
         return 0
 
-    removed = 0
-    cutoff = None
-    if older_than_hours is not None:
-        cutoff = datetime.now() - timedelta(hours=older_than_hours)
+    # Drop the in-process copies too; anything still valid is re-read from the database
+    _l1_discard()
+    _remove_legacy_files(cache_dir)
+
+    if older_than_hours is None:
+        from claude_mm import semantic_cache
 
-    for cache_file in cache_dir.glob("*.json"):
-        try:
-            if cutoff:
-                # Check file timestamp
-                with open(cache_file) as f:
-                    cache_data = json.load(f)
-                cached_at = datetime.fromisoformat(cache_data["timestamp"])
-                if cached_at > cutoff:
-                    continue
+        semantic_cache.reset(cache_dir)
 
-            cache_file.unlink()
-            removed += 1
-        except Exception:
-            # Skip files we can't process
-            continue
+    conn = _connect(cache_dir)
+    with _DB_LOCK:
+        if older_than_hours is None:
+            cursor = conn.execute("DELETE FROM cache")
+        else:
+            cutoff_ts = time.time() - older_than_hours * 3600
+            cursor = conn.execute("DELETE FROM cache WHERE ts < ?", (cutoff_ts,))
 
-    return removed
+    return cursor.rowcount
+
+
+def _remove_legacy_files(cache_dir: Path) -> None:
+    """Remove entries left by the old one-JSON-file-per-entry cache layout."""
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            try:
+                if entry.name.endswith(".json"):
+                    os.unlink(entry.path)
+                elif len(entry.name) == 2 and entry.is_dir(follow_symlinks=False):
+                    # Shard directories only ever held cache files
+                    shutil.rmtree(entry.path)
+            except OSError:
+                # Skip files we can't process
+                continue
 
 
 def get_cache_stats() -> dict:
@@ -156,39 +467,16 @@ def get_cache_stats() -> dict:
     Returns:
         Dictionary with cache stats
     """
-    cache_dir = get_cache_dir()
-    if not cache_dir.exists():
-        return {
-            "total_files": 0,
-            "total_size_mb": 0,
-            "oldest": None,
-            "newest": None,
-        }
-
-    total_files = 0
-    total_size = 0
-    oldest = None
-    newest = None
-
-    for cache_file in cache_dir.glob("*.json"):
-        try:
-            total_files += 1
-            total_size += cache_file.stat().st_size
-
-            with open(cache_file) as f:
-                cache_data = json.load(f)
-            cached_at = datetime.fromisoformat(cache_data["timestamp"])
-
-            if oldest is None or cached_at < oldest:
-                oldest = cached_at
-            if newest is None or cached_at > newest:
-                newest = cached_at
-        except Exception:
-            continue
+    conn = _connect(get_cache_dir())
+    with _DB_LOCK:
+        total_files, total_size, oldest_ts, newest_ts = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(CAST(response AS BLOB))), 0), MIN(ts), MAX(ts)"
+            " FROM cache"
+        ).fetchone()
 
     return {
         "total_files": total_files,
         "total_size_mb": round(total_size / (1024 * 1024), 2),
-        "oldest": oldest.isoformat() if oldest else None,
-        "newest": newest.isoformat() if newest else None,
+        "oldest": datetime.fromtimestamp(oldest_ts).isoformat() if oldest_ts else None,
+        "newest": datetime.fromtimestamp(newest_ts).isoformat() if newest_ts else None,
     }
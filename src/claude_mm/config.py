@@ -15,8 +15,18 @@ DEFAULT_CONFIG = {
     },
     "cost_warning_threshold": 0.10,
     "cache_ttl_hours": 24,
+    "normalize_cache_key": True,  # Ignore trailing whitespace/line endings in cache keys
+    "cache_min_chars": 64,  # Prompts shorter than this are not cached
+    "cache_max_chars": 200_000,  # Prompts longer than this are not cached
+    "cache_fsync": False,  # fdatasync cache entries before renaming them into place
+    "semantic_cache": False,  # Reuse responses for similar prompts (needs [semantic] extra)
+    "semantic_threshold": 0.92,  # Minimum cosine similarity for a semantic cache hit
+    "max_concurrent": 8,  # Max in-flight provider calls during multi-model review
 }
 
+# Parsed config files, keyed by path: (mtime_ns, config)
+_CFG_CACHE: dict = {}
+
 
 def load_config(config_path: Path = None):
     """
@@ -31,9 +41,16 @@ def load_config(config_path: Path = None):
     if config_path is None:
         config_path = Path.home() / ".config" / "ai" / "config.yaml"
 
-    if not config_path.exists():
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
         return DEFAULT_CONFIG.copy()
 
+    # Skip the YAML parse if the file hasn't changed since it was last loaded
+    cached = _CFG_CACHE.get(config_path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1].copy()
+
     try:
         import yaml
         with open(config_path) as f:
@@ -41,7 +58,8 @@ def load_config(config_path: Path = None):
         # Merge with defaults
         config = DEFAULT_CONFIG.copy()
         config.update(user_config)
-        return config
+        _CFG_CACHE[config_path] = (mtime_ns, config)
+        return config.copy()
     except ImportError:
         print("Warning: pyyaml not installed, using default config")
         return DEFAULT_CONFIG.copy()
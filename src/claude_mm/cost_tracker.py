@@ -15,6 +15,11 @@ Pricing Accuracy:
 - Anthropic Claude: Estimated pricing (verify with Anthropic for exact rates)
 """
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # API pricing (per 1M tokens)
 # Sources:
 # - OpenAI: https://openai.com/api/pricing/
@@ -80,6 +85,20 @@ PRICING = {
     "claude-sonnet-4-5-20250929": _CLAUDE_SONNET_PRICING.copy(),
 }
 
+# Flattened view of PRICING used by the cost math: one lookup unpacks every field
+# model -> (input, output, cached, is_estimated)
+_PRICING_T = {
+    name: (v["input"], v["output"], v["cached"], v["is_estimated"])
+    for name, v in PRICING.items()
+}
+
+# Per-token rates (USD per token) so the cost math is multiply/add only
+# model -> (input, output, cached, is_estimated)
+_PRICING_PT = {
+    name: (v[0] / 1_000_000, v[1] / 1_000_000, v[2] / 1_000_000, v[3])
+    for name, v in _PRICING_T.items()
+}
+
 # Rough token estimation (chars / 4)
 CHARS_PER_TOKEN = 4
 
@@ -88,8 +107,15 @@ def estimate_tokens(text: str) -> int:
     """Estimate token count from text (rough approximation)."""
     if not text:
         return 0
+    return estimate_tokens_from_len(len(text))
+
+
+def estimate_tokens_from_len(n_chars: int) -> int:
+    """Estimate token count from a text length in characters (rough approximation)."""
+    if not n_chars:
+        return 0
     # Return at least 1 token for non-empty strings
-    return max(1, len(text) // CHARS_PER_TOKEN)
+    return max(1, n_chars // CHARS_PER_TOKEN)
 
 
 def estimate_cost(
@@ -110,23 +136,22 @@ def estimate_cost(
     Returns:
         Estimated cost in USD
     """
-    if model not in PRICING:
+    try:
+        input_rate, output_rate, cached_rate, _ = _PRICING_PT[model]
+    except KeyError:
         available_models = ", ".join(PRICING.keys())
         raise ValueError(f"Unknown model '{model}'. Available models: {available_models}")
 
-    pricing = PRICING[model]
-
     # Validate cached_tokens to prevent negative token counts
     cached_tokens = max(0, min(cached_tokens, input_tokens))
 
-    # Calculate costs with safe lookups
+    # Calculate costs
     uncached_tokens = input_tokens - cached_tokens
-    input_cost = (uncached_tokens / 1_000_000) * pricing.get("input", 0)
-    cached_cost = (cached_tokens / 1_000_000) * pricing.get("cached", 0)
-    output_cost = (output_tokens / 1_000_000) * pricing.get("output", 0)
-
-    total_cost = input_cost + cached_cost + output_cost
-    return total_cost
+    return (
+        uncached_tokens * input_rate
+        + cached_tokens * cached_rate
+        + output_tokens * output_rate
+    )
 
 
 def estimate_cost_from_text(
@@ -147,17 +172,39 @@ def estimate_cost_from_text(
     Returns:
         Dictionary with cost breakdown
     """
+    n_chars = len(input_text) if input_text else 0
+    return estimate_cost_from_text_len(model, n_chars, expected_output_tokens, cached_ratio)
+
+
+def estimate_cost_from_text_len(
+    model: str,
+    n_chars: int,
+    expected_output_tokens: int = 1000,
+    cached_ratio: float = 0.0
+) -> dict:
+    """
+    Estimate cost from the length of the input text, without needing the text itself.
+
+    Args:
+        model: Model name
+        n_chars: Input prompt length in characters
+        expected_output_tokens: Expected output length in tokens
+        cached_ratio: Ratio of input that will be cached (0.0 to 1.0)
+
+    Returns:
+        Dictionary with cost breakdown (same as estimate_cost_from_text)
+    """
     # Validate cached_ratio
     if not (0.0 <= cached_ratio <= 1.0):
         raise ValueError(f"cached_ratio must be between 0.0 and 1.0, got {cached_ratio}")
 
-    input_tokens = estimate_tokens(input_text)
+    input_tokens = estimate_tokens_from_len(n_chars)
     cached_tokens = int(input_tokens * cached_ratio)
 
     cost = estimate_cost(model, input_tokens, expected_output_tokens, cached_tokens)
 
-    pricing = PRICING.get(model, {})
-    is_estimated = pricing.get("is_estimated", True)  # Default to True for safety
+    # estimate_cost() already rejected unknown models
+    is_estimated = _PRICING_T[model][3]
 
     return {
         "model": model,
@@ -170,6 +217,52 @@ def estimate_cost_from_text(
     }
 
 
+def estimate_costs_batch(
+    model: str,
+    texts: list,
+    expected_output_tokens: int = 1000,
+    cached_ratio: float = 0.0
+):
+    """
+    Estimate costs for many input texts at once (vectorized with NumPy).
+
+    Gives the same numbers as calling estimate_cost_from_text() per text, in a
+    handful of array operations instead of a Python loop.
+
+    Args:
+        model: Model name
+        texts: List of input prompt texts
+        expected_output_tokens: Expected output length in tokens (per text)
+        cached_ratio: Ratio of input that will be cached (0.0 to 1.0)
+
+    Returns:
+        Tuple of (costs, input_tokens) NumPy arrays, one element per text
+    """
+    if np is None:
+        raise ImportError("numpy is required for batch estimates. Run: pip install numpy")
+
+    if not (0.0 <= cached_ratio <= 1.0):
+        raise ValueError(f"cached_ratio must be between 0.0 and 1.0, got {cached_ratio}")
+
+    try:
+        input_rate, output_rate, cached_rate, _ = _PRICING_PT[model]
+    except KeyError:
+        available_models = ", ".join(PRICING.keys())
+        raise ValueError(f"Unknown model '{model}'. Available models: {available_models}")
+
+    # Same heuristic as estimate_tokens(): 0 for empty text, otherwise at least 1
+    lens = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    tokens = np.where(lens > 0, np.maximum(1, lens // CHARS_PER_TOKEN), 0)
+    cached = (tokens * cached_ratio).astype(np.int64)
+
+    costs = (
+        (tokens - cached) * input_rate
+        + cached * cached_rate
+        + expected_output_tokens * output_rate
+    )
+    return costs, tokens
+
+
 def format_cost_warning(model: str, estimated_cost: float, operation: str = "operation") -> str:
     """
     Format a cost warning message.
@@ -189,14 +282,16 @@ def format_cost_warning(model: str, estimated_cost: float, operation: str = "ope
     else:
         warning_level = "✓ Low cost"
 
+    input_rate, output_rate, _, _ = _PRICING_T.get(model, (0, 0, 0, True))
+
     return f"""
 {warning_level}: {operation}
 Model: {model}
 Estimated cost: ${estimated_cost:.4f}
 
 Billing rates (per 1M tokens):
-  Input:  ${PRICING.get(model, {}).get('input', 0):.2f}
-  Output: ${PRICING.get(model, {}).get('output', 0):.2f}
+  Input:  ${input_rate:.2f}
+  Output: ${output_rate:.2f}
 """
 
 
@@ -229,10 +324,15 @@ def should_warn_about_cost(model: str, estimated_cost: float, threshold: float =
 
 import hashlib
 import json
-import sys
+import logging
+import os
+import tempfile
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 def get_cost_log_path() -> Path:
     """Get the path to the cost log file."""
@@ -274,7 +374,7 @@ def log_api_call(
             f.write(json.dumps(entry) + "\n")
     except Exception as e:
         # Don't fail the operation if logging fails
-        print(f"Warning: Failed to log cost: {e}", file=sys.stderr)
+        logger.warning("Failed to log cost: %s", e)
 
 
 def get_usage_stats(days: int = None) -> dict:
@@ -287,9 +387,6 @@ def get_usage_stats(days: int = None) -> dict:
     Returns:
         Dictionary with usage statistics
     """
-    import sys
-    from datetime import timedelta
-
     log_path = get_cost_log_path()
     if not log_path.exists():
         return {
@@ -337,7 +434,7 @@ def get_usage_stats(days: int = None) -> dict:
                 by_operation[operation]["cost"] += cost
                 by_operation[operation]["calls"] += 1
     except Exception as e:
-        print(f"Warning: Failed to read cost log: {e}", file=sys.stderr)
+        logger.warning("Failed to read cost log: %s", e)
 
     return {
         "total_cost": round(total_cost, 4),
@@ -351,10 +448,18 @@ def get_usage_stats(days: int = None) -> dict:
 # Response Caching
 # ============================================================================
 
+# Created cache directories by home directory, so mkdir runs once per process
+_CACHE_DIRS: "dict[Path, Path]" = {}
+
+
 def get_cache_dir() -> Path:
-    """Get the cache directory path."""
-    cache_dir = Path.home() / ".config" / "ai" / "cache"
-    cache_dir.mkdir(parents=True, exist_ok=True)
+    """Get the cache directory path, creating it the first time it is used."""
+    home = Path.home()
+    cache_dir = _CACHE_DIRS.get(home)
+    if cache_dir is None:
+        cache_dir = home / ".config" / "ai" / "cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _CACHE_DIRS[home] = cache_dir
     return cache_dir
 
 
@@ -417,19 +522,32 @@ def cache_response(model: str, prompt: str, response: str, system_prompt: str =
     cache_key = get_cache_key(model, prompt, system_prompt)
     cache_file = cache_dir / f"{cache_key}.json"
 
+    now = time.time()
     cache_data = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.fromtimestamp(now).isoformat(),
         "model": model,
         "response": response,
     }
 
+    tmp_path = None
     try:
-        with open(cache_file, "w") as f:
+        # Write to a temp file and rename it into place, so a killed process can't
+        # leave a truncated entry behind
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".tmp-", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
             json.dump(cache_data, f)
+
+        # Keep mtime equal to the entry timestamp; clear_cache/get_cache_stats rely on it
+        os.utime(tmp_path, (now, now))
+        os.replace(tmp_path, cache_file)
     except Exception as e:
         # Don't fail the operation if caching fails
-        import sys
-        print(f"Warning: Failed to cache response: {e}", file=sys.stderr)
+        logger.warning("Failed to cache response: %s", e)
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
 
 
 def clear_cache(older_than_hours: int = None) -> int:
@@ -447,25 +565,25 @@ def clear_cache(older_than_hours: int = None) -> int:
         return 0
 
     removed = 0
-    cutoff = None
+    cutoff_ts = None
     if older_than_hours is not None:
-        cutoff = datetime.now() - timedelta(hours=older_than_hours)
-
-    for cache_file in cache_dir.glob("*.json"):
-        try:
-            if cutoff:
-                # Check file timestamp
-                with open(cache_file) as f:
-                    cache_data = json.load(f)
-                cached_at = datetime.fromisoformat(cache_data["timestamp"])
-                if cached_at > cutoff:
-                    continue
-
-            cache_file.unlink()
-            removed += 1
-        except Exception:
-            # Skip files we can't process
-            continue
+        cutoff_ts = time.time() - older_than_hours * 3600
+
+    # Entry age comes from the file mtime (set on write), so no file is opened here
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                if cutoff_ts is not None:
+                    if entry.stat(follow_symlinks=False).st_mtime > cutoff_ts:
+                        continue
+
+                os.unlink(entry.path)
+                removed += 1
+            except OSError:
+                # Skip files we can't process
+                continue
 
     return removed
 
@@ -488,30 +606,32 @@ def get_cache_stats() -> dict:
 
     total_files = 0
     total_size = 0
-    oldest = None
-    newest = None
+    oldest_ts = None
+    newest_ts = None
+
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
 
-    for cache_file in cache_dir.glob("*.json"):
-        try:
             total_files += 1
-            total_size += cache_file.stat().st_size
-
-            with open(cache_file) as f:
-                cache_data = json.load(f)
-            cached_at = datetime.fromisoformat(cache_data["timestamp"])
+            total_size += st.st_size
 
-            if oldest is None or cached_at < oldest:
-                oldest = cached_at
-            if newest is None or cached_at > newest:
-                newest = cached_at
-        except Exception:
-            continue
+            mtime = st.st_mtime
+            if oldest_ts is None or mtime < oldest_ts:
+                oldest_ts = mtime
+            if newest_ts is None or mtime > newest_ts:
+                newest_ts = mtime
 
     return {
         "total_files": total_files,
         "total_size_mb": round(total_size / (1024 * 1024), 2),
-        "oldest": oldest.isoformat() if oldest else None,
-        "newest": newest.isoformat() if newest else None,
+        "oldest": datetime.fromtimestamp(oldest_ts).isoformat() if oldest_ts else None,
+        "newest": datetime.fromtimestamp(newest_ts).isoformat() if newest_ts else None,
     }
 
 
@@ -519,22 +639,22 @@ if __name__ == "__main__":
     # Example usage
     print("Cost Estimation Examples:\n")
 
-    # Code review
+    # Code review (lengths stand in for repeated sample text; no large strings needed)
     review_input = "git diff with 500 lines of code changes"
-    review_estimate = estimate_cost_from_text("gpt-5.2-instant", review_input * 100, 500)
+    review_estimate = estimate_cost_from_text_len("gpt-5.2-instant", len(review_input) * 100, 500)
     print(f"Code Review (gpt-5.2-instant): {review_estimate['cost_formatted']}")
 
     # Planning
     plan_input = "Design user authentication system with OAuth, JWT, session management"
-    plan_estimate = estimate_cost_from_text("gpt-5.2", plan_input * 50, 2000)
+    plan_estimate = estimate_cost_from_text_len("gpt-5.2", len(plan_input) * 50, 2000)
     print(f"Planning (gpt-5.2): {plan_estimate['cost_formatted']}")
 
     # Stabilization (multi-round)
-    stabilize_estimate = estimate_cost_from_text("gpt-5.2", plan_input * 100, 4000)
+    stabilize_estimate = estimate_cost_from_text_len("gpt-5.2", len(plan_input) * 100, 4000)
     stabilize_total = stabilize_estimate['estimated_cost'] * 4  # 4 rounds
     print(f"Stabilization 2 rounds (gpt-5.2): ${stabilize_total:.4f}")
 
     # Pro warning
-    pro_estimate = estimate_cost_from_text("gpt-5.2-pro", plan_input * 100, 2000)
+    pro_estimate = estimate_cost_from_text_len("gpt-5.2-pro", len(plan_input) * 100, 2000)
     print(f"\nPro Model (gpt-5.2-pro): {pro_estimate['cost_formatted']}")
     print(format_cost_warning("gpt-5.2-pro", pro_estimate['estimated_cost'], "complex planning"))
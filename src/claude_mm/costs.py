@@ -10,10 +10,23 @@ Caching Support:
 - Anthropic Claude: Supports prompt caching with 90% discount on cached input tokens
 
 Pricing is loaded from pricing.py. This module adds caching discount calculations.
+
+Token counts for text estimates use tiktoken when it is installed
+(pip install claude-mm-tool[tokenizer]); otherwise a chars/4 heuristic is used.
 """
 
-from claude_mm.models import normalize_model_name
-from claude_mm.pricing import get_model_pricing
+from claude_mm.models import _MODEL_INDEX, normalize_model_name
+from claude_mm.pricing import get_model_pricing, load_pricing
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 # Caching discounts by provider
 CACHE_DISCOUNTS = {
@@ -25,13 +38,93 @@ CACHE_DISCOUNTS = {
 # Rough token estimation (chars / 4)
 CHARS_PER_TOKEN = 4
 
+# Per-token rates by model name: (input, output, cached input) in USD per token.
+# Built lazily and rebuilt whenever load_pricing() returns a new pricing dict (it only
+# does so after the pricing file changes).
+_COST_INDEX: dict = {}
+_cost_index_pricing = None
+
+# Names and aliases of the expensive "pro" tier models (flagged in warnings and estimates)
+_PRO_MODELS = frozenset(
+    name for name, (_, api_model) in _MODEL_INDEX.items() if "pro" in api_model.lower()
+)
+
+# Loaded tiktoken encoders by model name (None if one couldn't be loaded)
+_ENCODERS: dict = {}
+
 
-def estimate_tokens(text: str) -> int:
+def estimate_tokens_fast(text: str) -> int:
     """Estimate token count from text (rough approximation)."""
     if not text:
         return 0
+    return estimate_tokens_from_len(len(text))
+
+
+def estimate_tokens_from_len(n_chars: int) -> int:
+    """Estimate token count from a text length in characters (rough approximation)."""
+    if not n_chars:
+        return 0
     # Return at least 1 token for non-empty strings
-    return max(1, len(text) // CHARS_PER_TOKEN)
+    return max(1, n_chars // CHARS_PER_TOKEN)
+
+
+# Kept for existing callers; always the cheap approximation
+estimate_tokens = estimate_tokens_fast
+
+
+def _get_encoder(model: str):
+    """Get the tiktoken encoder for a model, loading it on first use."""
+    if model in _ENCODERS:
+        return _ENCODERS[model]
+
+    try:
+        provider, api_model = normalize_model_name(model)
+    except ValueError:
+        provider, api_model = None, model
+
+    encoder = None
+    try:
+        if provider == "openai":
+            try:
+                encoder = tiktoken.encoding_for_model(api_model)
+            except KeyError:
+                # Newer models may not be known to the installed tiktoken yet
+                encoder = tiktoken.get_encoding("o200k_base")
+        else:
+            # Other providers don't publish tokenizers; cl100k is a close approximation
+            encoder = tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Encoding files are downloaded on first use and may be unavailable offline
+        encoder = None
+
+    _ENCODERS[model] = encoder
+    return encoder
+
+
+def estimate_tokens_accurate(model: str, text: str) -> int:
+    """
+    Count tokens in text with the model's tokenizer.
+
+    Args:
+        model: Model name
+        text: Text to tokenize
+
+    Returns:
+        Token count
+
+    Raises:
+        ImportError: If tiktoken is not installed
+        RuntimeError: If the model's encoding could not be loaded
+    """
+    if tiktoken is None:
+        raise ImportError("tiktoken is required for accurate counts. Run: pip install tiktoken")
+
+    encoder = _get_encoder(model)
+    if encoder is None:
+        raise RuntimeError(f"Could not load a tiktoken encoding for {model}")
+
+    # Special-token text in a prompt is just text here, not a control token
+    return len(encoder.encode(text, disallowed_special=()))
 
 
 def estimate_cost(
@@ -52,31 +145,94 @@ def estimate_cost(
     Returns:
         Estimated cost in USD
     """
-    try:
-        provider, api_model = normalize_model_name(model)
-    except ValueError as e:
-        raise ValueError(f"Unknown model '{model}': {e}")
-
-    pricing = get_model_pricing(provider, api_model)
-    if not pricing:
-        raise ValueError(f"No pricing data available for {provider}/{api_model}")
+    input_rate, output_rate, cached_rate = _model_rates(model)
 
     # Validate cached_tokens to prevent negative token counts
     cached_tokens = max(0, min(cached_tokens, input_tokens))
 
     # Calculate costs
     uncached_tokens = input_tokens - cached_tokens
-    input_cost = (uncached_tokens / 1_000_000) * pricing.get("input", 0)
+    return (
+        uncached_tokens * input_rate
+        + cached_tokens * cached_rate
+        + output_tokens * output_rate
+    )
+
+
+def estimate_costs_batch(models, input_tokens, output_tokens, cached_tokens=None):
+    """
+    Estimate costs for many API calls at once (vectorized with NumPy).
+
+    Gives the same numbers as calling estimate_cost() per call, with one rate
+    lookup per distinct model and elementwise array math for the rest.
+
+    Args:
+        models: Model name for each call
+        input_tokens: Input token count for each call
+        output_tokens: Output token count for each call
+        cached_tokens: Cached input token count for each call (optional)
+
+    Returns:
+        NumPy array of estimated costs in USD, one element per call
+    """
+    if np is None:
+        raise ImportError("numpy is required for batch estimates. Run: pip install numpy")
+
+    input_tokens = np.asarray(input_tokens, dtype=np.int64)
+    output_tokens = np.asarray(output_tokens, dtype=np.int64)
+    if cached_tokens is None:
+        cached_tokens = np.zeros_like(input_tokens)
+    else:
+        # Same clamping as estimate_cost()
+        cached_tokens = np.clip(np.asarray(cached_tokens, dtype=np.int64), 0, input_tokens)
+
+    # Rates for each distinct model, then gathered per call
+    names, ids = np.unique(np.asarray(models, dtype=str), return_inverse=True)
+    # reshape keeps the (n, 3) shape when there are no calls (np.array([]) is 1-D)
+    rates = np.array(
+        [_model_rates(str(name)) for name in names], dtype=np.float64
+    ).reshape(-1, 3)
+    input_rate, output_rate, cached_rate = rates[ids].T
+
+    return (
+        (input_tokens - cached_tokens) * input_rate
+        + cached_tokens * cached_rate
+        + output_tokens * output_rate
+    )
 
-    # Apply caching discount
-    cache_discount = CACHE_DISCOUNTS.get(provider, 0.90)
-    cached_price = pricing.get("input", 0) * (1 - cache_discount)
-    cached_cost = (cached_tokens / 1_000_000) * cached_price
 
-    output_cost = (output_tokens / 1_000_000) * pricing.get("output", 0)
+def _model_rates(model: str) -> tuple:
+    """Get (input, output, cached input) per-token rates for a model."""
+    global _cost_index_pricing
 
-    total_cost = input_cost + cached_cost + output_cost
-    return total_cost
+    pricing = load_pricing()
+    if pricing is not _cost_index_pricing:
+        _COST_INDEX.clear()
+        _cost_index_pricing = pricing
+
+    rates = _COST_INDEX.get(model)
+    if rates is not None:
+        return rates
+
+    try:
+        provider, api_model = normalize_model_name(model)
+    except ValueError as e:
+        raise ValueError(f"Unknown model '{model}': {e}")
+
+    model_pricing = get_model_pricing(provider, api_model)
+    if not model_pricing:
+        raise ValueError(f"No pricing data available for {provider}/{api_model}")
+
+    # Apply caching discount to the input rate
+    input_rate = model_pricing.get("input", 0) / 1_000_000
+    cache_discount = CACHE_DISCOUNTS.get(provider, 0.90)
+    rates = (
+        input_rate,
+        model_pricing.get("output", 0) / 1_000_000,
+        input_rate * (1 - cache_discount),
+    )
+    _COST_INDEX[model] = rates
+    return rates
 
 
 def estimate_cost_from_text(
@@ -101,13 +257,53 @@ def estimate_cost_from_text(
     if not (0.0 <= cached_ratio <= 1.0):
         raise ValueError(f"cached_ratio must be between 0.0 and 1.0, got {cached_ratio}")
 
-    input_tokens = estimate_tokens(input_text)
+    # Prefer the model's real tokenizer, falling back to the heuristic
+    if tiktoken is not None and _get_encoder(model) is not None:
+        input_tokens = estimate_tokens_accurate(model, input_text)
+    else:
+        input_tokens = estimate_tokens_fast(input_text)
+
+    return _cost_breakdown(model, input_tokens, expected_output_tokens, cached_ratio)
+
+
+def estimate_cost_from_text_len(
+    model: str,
+    n_chars: int,
+    expected_output_tokens: int = 1000,
+    cached_ratio: float = 0.0
+) -> dict:
+    """
+    Estimate cost from the length of the input text, without needing the text itself.
+
+    Always uses the chars/4 heuristic, since there is no text to tokenize.
+
+    Args:
+        model: Model name
+        n_chars: Input prompt length in characters
+        expected_output_tokens: Expected output length in tokens
+        cached_ratio: Ratio of input that will be cached (0.0 to 1.0)
+
+    Returns:
+        Dictionary with cost breakdown (same as estimate_cost_from_text)
+    """
+    # Validate cached_ratio
+    if not (0.0 <= cached_ratio <= 1.0):
+        raise ValueError(f"cached_ratio must be between 0.0 and 1.0, got {cached_ratio}")
+
+    input_tokens = estimate_tokens_from_len(n_chars)
+    return _cost_breakdown(model, input_tokens, expected_output_tokens, cached_ratio)
+
+
+def _cost_breakdown(
+    model: str, input_tokens: int, expected_output_tokens: int, cached_ratio: float
+) -> dict:
+    """Build the cost breakdown returned by the estimate_cost_from_text* functions."""
     cached_tokens = int(input_tokens * cached_ratio)
 
     cost = estimate_cost(model, input_tokens, expected_output_tokens, cached_tokens)
 
     # Pro models are expensive, mark as estimated
-    is_estimated = "pro" in model.lower()
+    is_estimated = model in _PRO_MODELS
 
     return {
         "model": model,
@@ -132,19 +328,19 @@ def format_cost_warning(model: str, estimated_cost: float, operation: str = "ope
     Returns:
         Formatted warning string
     """
-    if "pro" in model.lower():
+    if model in _PRO_MODELS:
         warning_level = "⚠️  EXPENSIVE"
     elif estimated_cost > 0.10:
         warning_level = "💰 Moderate cost"
     else:
         warning_level = "✓ Low cost"
 
+    # Reuse the per-token rates estimate_cost already resolved for this model
     try:
-        provider, api_model = normalize_model_name(model)
-        pricing = get_model_pricing(provider, api_model)
-        input_price = pricing.get("input", 0) if pricing else 0
-        output_price = pricing.get("output", 0) if pricing else 0
-    except (ValueError, Exception):
+        input_rate, output_rate, _ = _model_rates(model)
+        input_price = input_rate * 1_000_000
+        output_price = output_rate * 1_000_000
+    except Exception:
         input_price = 0
         output_price = 0
 
@@ -186,22 +382,24 @@ if __name__ == "__main__":
     # Example usage
     print("Cost Estimation Examples:\n")
 
-    # Code review
+    # Code review (lengths stand in for repeated sample text; no large strings needed)
     review_input = "git diff with 500 lines of code changes"
-    review_estimate = estimate_cost_from_text("gpt-5.2-chat-latest", review_input * 100, 500)
+    review_estimate = estimate_cost_from_text_len(
+        "gpt-5.2-chat-latest", len(review_input) * 100, 500
+    )
     print(f"Code Review (gpt-5.2-chat-latest): {review_estimate['cost_formatted']}")
 
     # Planning
     plan_input = "Design user authentication system with OAuth, JWT, session management"
-    plan_estimate = estimate_cost_from_text("gpt-5.2", plan_input * 50, 2000)
+    plan_estimate = estimate_cost_from_text_len("gpt-5.2", len(plan_input) * 50, 2000)
     print(f"Planning (gpt-5.2): {plan_estimate['cost_formatted']}")
 
     # Stabilization (multi-round)
-    stabilize_estimate = estimate_cost_from_text("gpt-5.2", plan_input * 100, 4000)
+    stabilize_estimate = estimate_cost_from_text_len("gpt-5.2", len(plan_input) * 100, 4000)
     stabilize_total = stabilize_estimate['estimated_cost'] * 4  # 4 rounds
     print(f"Stabilization 2 rounds (gpt-5.2): ${stabilize_total:.4f}")
 
     # Pro warning
-    pro_estimate = estimate_cost_from_text("gpt-5.2-pro", plan_input * 100, 2000)
+    pro_estimate = estimate_cost_from_text_len("gpt-5.2-pro", len(plan_input) * 100, 2000)
     print(f"\nPro Model (gpt-5.2-pro): {pro_estimate['cost_formatted']}")
     print(format_cost_warning("gpt-5.2-pro", pro_estimate['estimated_cost'], "complex planning"))
@@ -55,6 +55,135 @@ CLAUDE_ALIASES = {
     "claude": "claude-sonnet-4-5-20250929",  # Default to latest Sonnet
 }
 
+# Flat lookup built once at import: name or alias -> (provider, api_model_name).
+# The registries above are fixed at import time; rebuild this if they are changed.
+_MODEL_INDEX: Dict[str, Tuple[str, str]] = {}
+for _provider, _models, _aliases in (
+    ("openai", OPENAI_MODELS, OPENAI_ALIASES),
+    ("google", GEMINI_MODELS, GEMINI_ALIASES),
+    ("anthropic", CLAUDE_MODELS, CLAUDE_ALIASES),
+):
+    # setdefault keeps the first match, preserving model-before-alias precedence
+    for _name, _api_name in _models.items():
+        _MODEL_INDEX.setdefault(_name, (_provider, _api_name))
+    for _alias, _target in _aliases.items():
+        _MODEL_INDEX.setdefault(_alias, (_provider, _models[_target]))
+del _provider, _models, _aliases, _name, _api_name, _alias, _target
+
+
+# ============================================================================
+# Display Names and Characteristics
+# ============================================================================
+
+# API model name -> user-friendly display name
+_DISPLAY_NAMES = {
+    # OpenAI
+    "gpt-5.2-chat-latest": "GPT-5.2 Instant",
+    "gpt-5.2": "GPT-5.2 Thinking",
+    "gpt-5.2-pro": "GPT-5.2 Pro",
+    "gpt-4o": "GPT-4o",
+    "gpt-4": "GPT-4",
+
+    # Gemini
+    "gemini-3-flash-preview": "Gemini 3 Flash",
+    "gemini-2.0-flash-exp": "Gemini 2.0 Flash (Experimental)",
+    "gemini-pro": "Gemini Pro",
+
+    # Claude
+    "claude-sonnet-4-5-20250929": "Claude Sonnet 4.5",
+    "claude-3-5-sonnet-20241022": "Claude 3.5 Sonnet",
+    "claude-3-opus-20240229": "Claude 3 Opus",
+    "claude-3-haiku-20240307": "Claude 3 Haiku",
+}
+
+# API model name -> speed, cost tier, context window and description
+_MODEL_CHARACTERISTICS = {
+    # OpenAI
+    "gpt-5.2-chat-latest": {
+        "speed": "fast",
+        "cost_tier": "low",
+        "context_window": 128000,
+        "description": "Fast workhorse for everyday tasks",
+    },
+    "gpt-5.2": {
+        "speed": "medium",
+        "cost_tier": "medium",
+        "context_window": 128000,
+        "description": "Thinking model for complex reasoning",
+    },
+    "gpt-5.2-pro": {
+        "speed": "slow",
+        "cost_tier": "high",
+        "context_window": 128000,
+        "description": "Premium model with highest quality",
+    },
+    "gpt-4o": {
+        "speed": "medium",
+        "cost_tier": "medium",
+        "context_window": 128000,
+        "description": "Previous generation GPT model",
+    },
+    "gpt-4": {
+        "speed": "slow",
+        "cost_tier": "high",
+        "context_window": 8192,
+        "description": "Legacy GPT-4 model",
+    },
+
+    # Gemini
+    "gemini-3-flash-preview": {
+        "speed": "fast",
+        "cost_tier": "low",
+        "context_window": 1000000,
+        "description": "Fast, cheap Gemini model",
+    },
+    "gemini-2.0-flash-exp": {
+        "speed": "fast",
+        "cost_tier": "low",
+        "context_window": 1000000,
+        "description": "Experimental Gemini 2.0",
+    },
+    "gemini-pro": {
+        "speed": "medium",
+        "cost_tier": "low",
+        "context_window": 1000000,
+        "description": "Standard Gemini model",
+    },
+
+    # Claude
+    "claude-sonnet-4-5-20250929": {
+        "speed": "fast",
+        "cost_tier": "medium",
+        "context_window": 200000,
+        "description": "Latest Claude Sonnet",
+    },
+    "claude-3-5-sonnet-20241022": {
+        "speed": "fast",
+        "cost_tier": "medium",
+        "context_window": 200000,
+        "description": "Previous Claude Sonnet",
+    },
+    "claude-3-opus-20240229": {
+        "speed": "slow",
+        "cost_tier": "high",
+        "context_window": 200000,
+        "description": "Most capable Claude model",
+    },
+    "claude-3-haiku-20240307": {
+        "speed": "fast",
+        "cost_tier": "low",
+        "context_window": 200000,
+        "description": "Fast, cheap Claude model",
+    },
+}
+
+_UNKNOWN_CHARACTERISTICS = {
+    "speed": "unknown",
+    "cost_tier": "unknown",
+    "context_window": 8192,
+    "description": "Unknown model",
+}
+
 
 # ============================================================================
 # Provider-Model Mappings
@@ -70,19 +199,8 @@ def get_provider_for_model(model: str) -> Optional[str]:
     Returns:
         Provider name ("openai", "google", "anthropic") or None if unknown
     """
-    # Check OpenAI
-    if model in OPENAI_MODELS or model in OPENAI_ALIASES:
-        return "openai"
-
-    # Check Gemini
-    if model in GEMINI_MODELS or model in GEMINI_ALIASES:
-        return "google"
-
-    # Check Claude
-    if model in CLAUDE_MODELS or model in CLAUDE_ALIASES:
-        return "anthropic"
-
-    return None
+    entry = _MODEL_INDEX.get(model)
+    return entry[0] if entry else None
 
 
 def normalize_model_name(model: str) -> Tuple[str, str]:
@@ -106,25 +224,10 @@ def normalize_model_name(model: str) -> Tuple[str, str]:
         >>> normalize_model_name("gemini")
         ("google", "gemini-3-flash-preview")
     """
-    # Try OpenAI
-    if model in OPENAI_MODELS:
-        return "openai", OPENAI_MODELS[model]
-    if model in OPENAI_ALIASES:
-        return "openai", OPENAI_MODELS[OPENAI_ALIASES[model]]
-
-    # Try Gemini
-    if model in GEMINI_MODELS:
-        return "google", GEMINI_MODELS[model]
-    if model in GEMINI_ALIASES:
-        return "google", GEMINI_MODELS[GEMINI_ALIASES[model]]
-
-    # Try Claude
-    if model in CLAUDE_MODELS:
-        return "anthropic", CLAUDE_MODELS[model]
-    if model in CLAUDE_ALIASES:
-        return "anthropic", CLAUDE_MODELS[CLAUDE_ALIASES[model]]
-
-    raise ValueError(f"Unknown model: {model}")
+    try:
+        return _MODEL_INDEX[model]
+    except KeyError:
+        raise ValueError(f"Unknown model: {model}")
 
 
 def get_model_display_name(api_model: str) -> str:
@@ -137,27 +240,7 @@ def get_model_display_name(api_model: str) -> str:
     Returns:
         Display name (e.g., "GPT-5.2 Instant")
     """
-    display_names = {
-        # OpenAI
-        "gpt-5.2-chat-latest": "GPT-5.2 Instant",
-        "gpt-5.2": "GPT-5.2 Thinking",
-        "gpt-5.2-pro": "GPT-5.2 Pro",
-        "gpt-4o": "GPT-4o",
-        "gpt-4": "GPT-4",
-
-        # Gemini
-        "gemini-3-flash-preview": "Gemini 3 Flash",
-        "gemini-2.0-flash-exp": "Gemini 2.0 Flash (Experimental)",
-        "gemini-pro": "Gemini Pro",
-
-        # Claude
-        "claude-sonnet-4-5-20250929": "Claude Sonnet 4.5",
-        "claude-3-5-sonnet-20241022": "Claude 3.5 Sonnet",
-        "claude-3-opus-20240229": "Claude 3 Opus",
-        "claude-3-haiku-20240307": "Claude 3 Haiku",
-    }
-
-    return display_names.get(api_model, api_model)
+    return _DISPLAY_NAMES.get(api_model, api_model)
 
 
 def get_model_characteristics(api_model: str) -> Dict[str, any]:
@@ -170,93 +253,8 @@ def get_model_characteristics(api_model: str) -> Dict[str, any]:
     Returns:
         Dictionary with model characteristics
     """
-    # Model characteristics
-    chars = {
-        # OpenAI
-        "gpt-5.2-chat-latest": {
-            "speed": "fast",
-            "cost_tier": "low",
-            "context_window": 128000,
-            "description": "Fast workhorse for everyday tasks",
-        },
-        "gpt-5.2": {
-            "speed": "medium",
-            "cost_tier": "medium",
-            "context_window": 128000,
-            "description": "Thinking model for complex reasoning",
-        },
-        "gpt-5.2-pro": {
-            "speed": "slow",
-            "cost_tier": "high",
-            "context_window": 128000,
-            "description": "Premium model with highest quality",
-        },
-        "gpt-4o": {
-            "speed": "medium",
-            "cost_tier": "medium",
-            "context_window": 128000,
-            "description": "Previous generation GPT model",
-        },
-        "gpt-4": {
-            "speed": "slow",
-            "cost_tier": "high",
-            "context_window": 8192,
-            "description": "Legacy GPT-4 model",
-        },
-
-        # Gemini
-        "gemini-3-flash-preview": {
-            "speed": "fast",
-            "cost_tier": "low",
-            "context_window": 1000000,
-            "description": "Fast, cheap Gemini model",
-        },
-        "gemini-2.0-flash-exp": {
-            "speed": "fast",
-            "cost_tier": "low",
-            "context_window": 1000000,
-            "description": "Experimental Gemini 2.0",
-        },
-        "gemini-pro": {
-            "speed": "medium",
-            "cost_tier": "low",
-            "context_window": 1000000,
-            "description": "Standard Gemini model",
-        },
-
-        # Claude
-        "claude-sonnet-4-5-20250929": {
-            "speed": "fast",
-            "cost_tier": "medium",
-            "context_window": 200000,
-            "description": "Latest Claude Sonnet",
-        },
-        "claude-3-5-sonnet-20241022": {
-            "speed": "fast",
-            "cost_tier": "medium",
-            "context_window": 200000,
-            "description": "Previous Claude Sonnet",
-        },
-        "claude-3-opus-20240229": {
-            "speed": "slow",
-            "cost_tier": "high",
-            "context_window": 200000,
-            "description": "Most capable Claude model",
-        },
-        "claude-3-haiku-20240307": {
-            "speed": "fast",
-            "cost_tier": "low",
-            "context_window": 200000,
-            "description": "Fast, cheap Claude model",
-        },
-    }
-
-    return chars.get(api_model, {
-        "speed": "unknown",
-        "cost_tier": "unknown",
-        "context_window": 8192,
-        "description": "Unknown model",
-    })
+    # Copy so callers can't modify the shared table
+    return dict(_MODEL_CHARACTERISTICS.get(api_model, _UNKNOWN_CHARACTERISTICS))
 
 
 def list_all_models() -> Dict[str, list]:
@@ -1,11 +1,16 @@
 """
 External pricing configuration with auto-update capability.
 
-This module manages LLM pricing data in an external YAML file that can be
+This module manages LLM pricing data in an external JSON file that can be
 updated independently of the code. Includes fallback to embedded defaults.
+Older pricing.yaml files are migrated to JSON on first load.
 """
 
+import gzip
 import json
+import logging
+import os
+import tempfile
 import urllib.request
 from datetime import datetime
 from pathlib import Path
@@ -13,6 +18,25 @@ from typing import Dict, Optional
 
 import yaml
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # libyaml-backed loader, for migrating old YAML pricing files
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+logger = logging.getLogger(__name__)
+
+# Pricing file paths by home directory, so the config dir is only created once
+_PRICING_FILES: Dict[Path, Path] = {}
+
+# Parsed pricing files, keyed by path: (mtime_ns, pricing)
+_PRICING_CACHE: Dict[Path, tuple] = {}
+
 DEFAULT_PRICING = {
     "openai": {
         "gpt-5.2-chat-latest": {"input": 0.40, "output": 1.60},  # GPT-5.2 Instant (fast)
@@ -42,9 +66,19 @@ DEFAULT_PRICING = {
 
 def get_pricing_file() -> Path:
     """Get the path to the pricing configuration file."""
-    config_dir = Path.home() / ".config" / "system-playbooks"
-    config_dir.mkdir(parents=True, exist_ok=True)
-    return config_dir / "pricing.yaml"
+    home = Path.home()
+    pricing_file = _PRICING_FILES.get(home)
+    if pricing_file is None:
+        config_dir = home / ".config" / "system-playbooks"
+        config_dir.mkdir(parents=True, exist_ok=True)
+        pricing_file = config_dir / "pricing.json"
+        _PRICING_FILES[home] = pricing_file
+    return pricing_file
+
+
+def _get_legacy_pricing_file() -> Path:
+    """Get the path to the YAML pricing file used by older versions."""
+    return get_pricing_file().with_suffix(".yaml")
 
 
 def load_pricing() -> Dict:
@@ -59,13 +93,30 @@ def load_pricing() -> Dict:
     # If file exists and is recent, use it
     if pricing_file.exists():
         try:
-            with open(pricing_file) as f:
-                pricing = yaml.safe_load(f)
+            # Skip the parse if the file hasn't changed since it was last loaded
+            mtime_ns = pricing_file.stat().st_mtime_ns
+            cached = _PRICING_CACHE.get(pricing_file)
+            if cached and cached[0] == mtime_ns:
+                return cached[1]
+
+            with open(pricing_file, "rb") as f:
+                pricing = orjson.loads(f.read()) if orjson is not None else json.load(f)
                 if pricing and "_metadata" in pricing:
+                    _PRICING_CACHE[pricing_file] = (mtime_ns, pricing)
                     return pricing
         except Exception as e:
-            print(f"Warning: Failed to load pricing file: {e}")
-            print("Using embedded defaults")
+            logger.warning("Failed to load pricing file: %s; using embedded defaults", e)
+
+    # Migrate pricing saved as YAML by older versions
+    elif _get_legacy_pricing_file().exists():
+        try:
+            with open(_get_legacy_pricing_file()) as f:
+                pricing = yaml.load(f, Loader=_SafeLoader)
+            if pricing and "_metadata" in pricing:
+                save_pricing(pricing)
+                return pricing
+        except Exception as e:
+            logger.warning("Failed to load pricing file: %s; using embedded defaults", e)
 
     # Otherwise, create with defaults
     save_pricing(DEFAULT_PRICING)
@@ -81,11 +132,21 @@ def save_pricing(pricing: Dict) -> None:
     """
     pricing_file = get_pricing_file()
 
+    tmp_path = None
     try:
-        with open(pricing_file, "w") as f:
-            yaml.dump(pricing, f, default_flow_style=False, sort_keys=False)
+        # Write to a temp file and rename it into place, so readers never see a
+        # partially written file
+        fd, tmp_path = tempfile.mkstemp(dir=pricing_file.parent, prefix=".tmp-", suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(pricing, f, indent=2)
+        os.replace(tmp_path, pricing_file)
     except Exception as e:
-        print(f"Warning: Failed to save pricing file: {e}")
+        logger.warning("Failed to save pricing file: %s", e)
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
 
 
 def get_model_pricing(provider: str, model: str) -> Optional[Dict]:
@@ -138,9 +199,21 @@ def update_pricing_from_url(url: str) -> bool:
             ...
         }
     """
+    request = urllib.request.Request(
+        url, headers={"Accept-Encoding": "gzip", "User-Agent": "claude-mm-tool"}
+    )
+
     try:
-        with urllib.request.urlopen(url, timeout=5) as response:
-            new_pricing = json.loads(response.read().decode())
+        with urllib.request.urlopen(request, timeout=5) as response:
+            stream = response
+            if response.headers.get("Content-Encoding") == "gzip":
+                stream = gzip.GzipFile(fileobj=response)
+
+            # Parse straight from the stream rather than buffering a decoded copy
+            if orjson is not None:
+                new_pricing = orjson.loads(stream.read())
+            else:
+                new_pricing = json.load(stream)
 
             # Add metadata
             new_pricing["_metadata"] = {
@@ -152,16 +225,16 @@ def update_pricing_from_url(url: str) -> bool:
             # Validate basic structure
             required_providers = ["openai", "google", "anthropic"]
             if not all(p in new_pricing for p in required_providers):
-                print("Warning: Pricing data missing required providers")
+                logger.warning("Pricing data missing required providers")
                 return False
 
             # Save new pricing
             save_pricing(new_pricing)
-            print(f"✓ Updated pricing from {url}")
+            logger.info("Updated pricing from %s", url)
             return True
 
     except Exception as e:
-        print(f"Failed to update pricing from {url}: {e}")
+        logger.warning("Failed to update pricing from %s: %s", url, e)
         return False
 
 
@@ -210,6 +283,8 @@ if __name__ == "__main__":
         url = sys.argv[2] if len(sys.argv) > 2 else None
         if url:
             success = update_pricing_from_url(url)
+            if success:
+                print(f"✓ Updated pricing from {url}")
             sys.exit(0 if success else 1)
         else:
             print("Usage: python pricing.py update <url>")
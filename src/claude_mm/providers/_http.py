@@ -0,0 +1,79 @@
+"""
+Shared HTTP connection pool for the async provider SDKs.
+
+The Anthropic and OpenAI async clients are both handed the same httpx.AsyncClient,
+so a review fanning out to both providers shares one pool (and, with the optional
+'http2' extra, multiplexes concurrent requests over HTTP/2 streams) instead of each
+SDK opening its own connections.
+
+The sync API closes a loop's client before its asyncio.run() loop exits. Callers
+running their own loop (e.g. with review_async) can await aclose_async_http()
+before shutting it down; clients of loops still running at exit are closed then.
+"""
+
+import asyncio
+import atexit
+import weakref
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 - httpx only speaks HTTP/2 when h2 is installed
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# Matches the SDKs' default request timeout, with a quicker connect timeout
+_TIMEOUT = 600.0
+_CONNECT_TIMEOUT = 5.0
+_MAX_CONNECTIONS = 100
+_MAX_KEEPALIVE = 20
+
+# httpx async clients are bound to the event loop they were first used on
+_ASYNC_CLIENTS = weakref.WeakKeyDictionary()
+
+
+def get_async_http():
+    """
+    Get the shared httpx.AsyncClient for the running event loop.
+
+    Returns:
+        The client, or None if httpx isn't installed (SDKs then use their own)
+    """
+    if httpx is None:
+        return None
+
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=_HTTP2,
+            limits=httpx.Limits(
+                max_connections=_MAX_CONNECTIONS,
+                max_keepalive_connections=_MAX_KEEPALIVE,
+            ),
+            timeout=httpx.Timeout(_TIMEOUT, connect=_CONNECT_TIMEOUT),
+        )
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+async def aclose_async_http():
+    """Close the shared client for the running event loop, if one was created."""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+@atexit.register
+def _close_at_exit():
+    """Close clients whose event loops are still running in other threads."""
+    for loop, client in list(_ASYNC_CLIENTS.items()):
+        if loop.is_running() and not loop.is_closed():
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+            except Exception:
+                pass
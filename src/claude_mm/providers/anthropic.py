@@ -1,12 +1,42 @@
 """Anthropic (Claude) provider implementation."""
 
+import asyncio
 import os
-from typing import Optional
+import time
+import weakref
+from decimal import Decimal
+from typing import AsyncIterator, Callable, List, Mapping, Optional
 
 from claude_mm.pricing import get_model_pricing
 from claude_mm.retry import retry_with_backoff
 
-from .base import Provider, ProviderError, ProviderResponse
+from ._http import get_async_http
+from .base import (
+    Provider,
+    ProviderError,
+    ProviderResponse,
+    cached_completion,
+    pricing_cache,
+    rate_limited,
+    single_flight,
+)
+
+try:
+    from anthropic import Anthropic, AsyncAnthropic
+except ImportError:
+    Anthropic = None
+    AsyncAnthropic = None
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant."
+DEFAULT_MAX_TOKENS = 4096
+
+# Built once and shared by requests using the default prompt (the SDK doesn't mutate it)
+_DEFAULT_SYSTEM_BLOCKS = [
+    {"type": "text", "text": DEFAULT_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+]
+
+# Message Batches are billed at half the standard rate
+BATCH_DISCOUNT = Decimal("0.5")
 
 
 class AnthropicProvider(Provider):
@@ -32,6 +62,36 @@ class AnthropicProvider(Provider):
                 "Set via environment or pass to constructor."
             )
 
+        # Clients are created on first use and reused so requests share one connection
+        # pool. Async clients are bound to the event loop they were created on and
+        # share that loop's HTTP pool with the other providers.
+        self._client = None
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _get_client(self):
+        """Get the (lazily created) sync client."""
+        if self._client is None:
+            if Anthropic is None:
+                raise ProviderError(
+                    "anthropic package not installed. Run: pip install anthropic"
+                )
+            self._client = Anthropic(api_key=self.api_key)
+        return self._client
+
+    def _get_async_client(self):
+        """Get the (lazily created) async client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            if AsyncAnthropic is None:
+                raise ProviderError(
+                    "anthropic package not installed. Run: pip install anthropic"
+                )
+            client = AsyncAnthropic(api_key=self.api_key, http_client=get_async_http())
+            self._async_clients[loop] = client
+        return client
+
+    @cached_completion
     @retry_with_backoff(max_attempts=3, initial_delay=1, max_delay=10)
     def complete(
         self,
@@ -51,69 +111,26 @@ class AnthropicProvider(Provider):
             system_prompt: Optional system prompt
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
-            **kwargs: Additional Claude parameters
+            **kwargs: Additional Claude parameters (enable_prompt_cache=False sends the
+                system prompt without cache_control)
 
         Returns:
             ProviderResponse with completion and usage
         """
-        try:
-            from anthropic import Anthropic
-        except ImportError:
-            raise ProviderError(
-                "anthropic package not installed. Run: pip install anthropic"
-            )
-
-        client = Anthropic(api_key=self.api_key)
-
-        if not system_prompt:
-            system_prompt = "You are a helpful AI assistant."
+        client = self._get_client()
 
-        # Default max_tokens for Claude
-        if not max_tokens:
-            max_tokens = 4096
+        params = self._make_params(prompt, model, system_prompt, temperature, max_tokens, kwargs)
 
         try:
-            # Build request parameters
-            params = {
-                "model": model,
-                "max_tokens": max_tokens,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-                "system": system_prompt,
-                "temperature": temperature,
-            }
-
-            # Add any additional parameters
-            params.update(kwargs)
-
             response = client.messages.create(**params)
-
-            # Extract usage info
-            input_tokens = response.usage.input_tokens if response.usage else 0
-            output_tokens = response.usage.output_tokens if response.usage else 0
-
-            # Calculate cost
-            cost = self.estimate_cost(input_tokens, output_tokens, model)
-
-            # Extract text content
-            text_content = ""
-            for block in response.content:
-                if block.type == "text":
-                    text_content += block.text
-
-            return ProviderResponse(
-                text=text_content,
-                model=model,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                cost=cost,
-                cached=False,
-            )
+            return self._to_response(response, model)
 
         except Exception as e:
             raise ProviderError(f"Anthropic API error: {e}")
 
+    @cached_completion
+    @single_flight
+    @rate_limited
     async def complete_async(
         self,
         prompt: str,
@@ -132,76 +149,223 @@ class AnthropicProvider(Provider):
             system_prompt: Optional system prompt
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
-            **kwargs: Additional Claude parameters
+            **kwargs: Additional Claude parameters (enable_prompt_cache=False sends the
+                system prompt without cache_control)
 
         Returns:
             ProviderResponse with completion and usage
         """
+        client = self._get_async_client()
+
+        params = self._make_params(prompt, model, system_prompt, temperature, max_tokens, kwargs)
+
         try:
-            from anthropic import AsyncAnthropic
-        except ImportError:
-            raise ProviderError(
-                "anthropic package not installed. Run: pip install anthropic"
-            )
+            response = await client.messages.create(**params)
+            return self._to_response(response, model)
+
+        except Exception as e:
+            raise ProviderError(f"Anthropic API error: {e}")
 
-        client = AsyncAnthropic(api_key=self.api_key)
+    async def stream_complete_async(
+        self,
+        prompt: str,
+        model: str = "claude-sonnet-4-5-20250929",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        on_response: Optional[Callable[[ProviderResponse], None]] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Streaming Anthropic Claude completion.
+
+        Args:
+            prompt: User prompt
+            model: Model identifier
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            on_response: Called with the complete ProviderResponse once the stream ends
+            **kwargs: Additional Claude parameters (as for complete)
 
-        if not system_prompt:
-            system_prompt = "You are a helpful AI assistant."
+        Yields:
+            Text chunks of the completion
+        """
+        client = self._get_async_client()
 
-        # Default max_tokens for Claude
-        if not max_tokens:
-            max_tokens = 4096
+        params = self._make_params(prompt, model, system_prompt, temperature, max_tokens, kwargs)
 
         try:
-            # Build request parameters
-            params = {
-                "model": model,
-                "max_tokens": max_tokens,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-                "system": system_prompt,
-                "temperature": temperature,
-            }
+            async with client.messages.stream(**params) as stream:
+                async for text in stream.text_stream:
+                    yield text
+                message = await stream.get_final_message()
+        except Exception as e:
+            raise ProviderError(f"Anthropic API error: {e}")
 
-            # Add any additional parameters
-            params.update(kwargs)
+        if on_response is not None:
+            on_response(self._to_response(message, model))
 
-            response = await client.messages.create(**params)
+    def complete_batch(
+        self,
+        prompts: List[str],
+        model: str = "claude-sonnet-4-5-20250929",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_poll_interval: float = 60.0,
+        **kwargs
+    ) -> List[ProviderResponse]:
+        """
+        Complete many prompts through the Message Batches API.
 
-            # Extract usage info
-            input_tokens = response.usage.input_tokens if response.usage else 0
-            output_tokens = response.usage.output_tokens if response.usage else 0
-
-            # Calculate cost
-            cost = self.estimate_cost(input_tokens, output_tokens, model)
-
-            # Extract text content
-            text_content = ""
-            for block in response.content:
-                if block.type == "text":
-                    text_content += block.text
-
-            return ProviderResponse(
-                text=text_content,
-                model=model,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                cost=cost,
-                cached=False,
-            )
+        Batches are billed at half the normal rate but can take minutes (up to 24h)
+        to finish, so this suits bulk, non-interactive work. Blocks until the batch
+        has ended.
+
+        Args:
+            prompts: User prompts
+            model: Model identifier
+            system_prompt: Optional system prompt (shared by all prompts)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate per prompt
+            max_poll_interval: Longest wait between status checks, in seconds
+            **kwargs: Additional Claude parameters (as for complete)
+
+        Returns:
+            ProviderResponses in prompt order. A prompt that failed (or expired)
+            gets empty text and the reason in metadata["error"].
+        """
+        client = self._get_client()
+
+        # Parameters shared by every request; only the messages differ
+        params = self._make_params("", model, system_prompt, temperature, max_tokens, kwargs)
+        requests = [
+            {
+                "custom_id": f"req-{i}",
+                "params": {**params, "messages": [{"role": "user", "content": prompt}]},
+            }
+            for i, prompt in enumerate(prompts)
+        ]
+
+        try:
+            batch = client.messages.batches.create(requests=requests)
+
+            # Poll with exponentially growing intervals until processing has ended
+            interval = 1.0
+            while batch.processing_status != "ended":
+                time.sleep(interval)
+                interval = min(interval * 2, max_poll_interval)
+                batch = client.messages.batches.retrieve(batch.id)
+
+            responses: List[Optional[ProviderResponse]] = [None] * len(prompts)
+            for entry in client.messages.batches.results(batch.id):
+                index = int(entry.custom_id.split("-", 1)[1])
+                if entry.result.type == "succeeded":
+                    response = self._to_response(
+                        entry.result.message, model, cost_factor=BATCH_DISCOUNT
+                    )
+                else:
+                    error = getattr(entry.result, "error", None) or entry.result.type
+                    response = ProviderResponse(
+                        text="", model=model, input_tokens=0, output_tokens=0,
+                        metadata={"error": str(error)}, cost_picodollars=0,
+                    )
+                responses[index] = response
 
         except Exception as e:
-            raise ProviderError(f"Anthropic API error: {e}")
+            raise ProviderError(f"Anthropic batch API error: {e}")
 
-    def get_model_info(self, model: str) -> dict:
-        """Get Anthropic model information."""
-        pricing = get_model_pricing("anthropic", model)
+        return responses
 
+    def _make_params(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        extra: dict,
+    ) -> dict:
+        """Build Messages API request parameters, with extra Claude parameters merged in."""
+        enable_prompt_cache = extra.pop("enable_prompt_cache", True)
         return {
-            "provider": "anthropic",
             "model": model,
-            "pricing": pricing,
-            "context_window": 200000,
+            "max_tokens": max_tokens or DEFAULT_MAX_TOKENS,
+            "messages": [{"role": "user", "content": prompt}],
+            "system": _system(system_prompt, enable_prompt_cache),
+            "temperature": temperature,
+            **extra,
         }
+
+    def _to_response(self, response, model: str, cost_factor=1) -> ProviderResponse:
+        """Convert an Anthropic Message into a ProviderResponse, scaling its cost by cost_factor."""
+        # Extract usage info
+        usage = response.usage
+        input_tokens = usage.input_tokens if usage else 0
+        output_tokens = usage.output_tokens if usage else 0
+        metadata = {
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        }
+
+        # Calculate cost (input_tokens excludes prompt-cache writes and reads)
+        cost = self.estimate_cost_picodollars(input_tokens, output_tokens, model)
+        cost += self._prompt_cache_cost(metadata, model)
+        if cost_factor != 1:
+            cost = int(cost * cost_factor)
+
+        # Extract text content
+        text_content = "".join(
+            block.text for block in response.content if block.type == "text"
+        )
+
+        return ProviderResponse(
+            text=text_content,
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached=False,
+            metadata=metadata,
+            cost_picodollars=cost,
+        )
+
+    def _prompt_cache_cost(self, metadata: dict, model: str) -> int:
+        """Picodollar cost of prompt-cache writes (1.25x input rate) and reads (0.1x input rate)."""
+        input_rate, _ = self._token_rates(model)
+        return input_rate * (
+            125 * metadata["cache_creation_input_tokens"]
+            + 10 * metadata["cache_read_input_tokens"]
+        ) // 100
+
+    def get_model_info(self, model: str) -> Mapping:
+        """Get Anthropic model information."""
+        return _anthropic_info(model)
+
+
+@pricing_cache
+def _anthropic_info(model: str) -> dict:
+    """Build Anthropic model information (memoized per model)."""
+    pricing = get_model_pricing("anthropic", model)
+
+    return {
+        "provider": "anthropic",
+        "model": model,
+        "pricing": pricing,
+        "rpm": (pricing or {}).get("rpm"),
+        "context_window": 200000,
+    }
+
+
+def _system(system_prompt: Optional[str], enable_prompt_cache: bool):
+    """
+    Get the system parameter for a request.
+
+    With prompt caching, the system prompt is marked as a cacheable prefix so repeated
+    requests are billed (and prefilled) at the cached-input rate.
+    """
+    if not enable_prompt_cache:
+        return system_prompt or DEFAULT_SYSTEM_PROMPT
+    if not system_prompt:
+        return _DEFAULT_SYSTEM_BLOCKS
+    return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
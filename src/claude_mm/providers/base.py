@@ -5,10 +5,40 @@ All provider implementations must inherit from Provider and implement
 the abstract methods for both sync and async operations.
 """
 
+import asyncio
+import dataclasses
+import inspect
+import weakref
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional
+from functools import lru_cache, wraps
+from types import MappingProxyType
+from typing import AsyncIterator, Callable, Dict, Mapping, Optional
+
+from claude_mm.cache import cache_response, get_cached_response
+from claude_mm.pricing import load_pricing
+
+# Costs are accounted in integer picodollars (1e-12 USD) and only converted to Decimal
+# USD for ProviderResponse.cost
+PICODOLLARS_PER_DOLLAR = 10**12
+
+# Per-token (input, output) picodollar rates by (provider class, model). Rebuilt whenever
+# load_pricing() returns a new pricing dict (it only does so after the file changes).
+_RATES_PICO: Dict[tuple, tuple] = {}
+_rates_pricing = None
+
+# lru_caches of functions of the pricing data, cleared along with _RATES_PICO
+_PRICING_CACHES: list = []
+
+# In-flight async completions, keyed by (event loop, provider, call arguments)
+_INFLIGHT: Dict[tuple, asyncio.Task] = {}
+
+# Requests per minute assumed for models whose info doesn't declare an "rpm"
+DEFAULT_RPM = 20
+
+# Per-model concurrency limits: event loop -> {(provider class, model): Semaphore}
+_SEMAPHORES = weakref.WeakKeyDictionary()
 
 
 @dataclass
@@ -17,7 +47,8 @@ class ProviderResponse:
     Standardized response from any LLM provider.
 
     This ensures consistent handling of responses regardless of which
-    provider is being used.
+    provider is being used. Providers may give the cost as integer
+    cost_picodollars only; cost (Decimal USD) is then derived from it.
     """
     text: str
     model: str
@@ -26,6 +57,11 @@ class ProviderResponse:
     cost: Optional[Decimal] = None
     cached: bool = False
     metadata: Optional[dict] = None
+    cost_picodollars: Optional[int] = None
+
+    def __post_init__(self):
+        if self.cost is None and self.cost_picodollars is not None:
+            self.cost = Decimal(self.cost_picodollars) / PICODOLLARS_PER_DOLLAR
 
 
 class ProviderError(Exception):
@@ -33,6 +69,174 @@ class ProviderError(Exception):
     pass
 
 
+def cached_completion(func):
+    """
+    Decorator serving a provider completion method from the response cache.
+
+    Only deterministic requests are cached: temperature 0 on a model that honors
+    it (see Provider.supports_temperature), no max_tokens and no extra SDK
+    parameters. Anything else could legitimately return a different response.
+    Callers can opt out per call with use_cache=False.
+    """
+    signature = inspect.signature(func)
+
+    def cache_args(self, args, kwargs):
+        use_cache = kwargs.pop("use_cache", True)
+        call = signature.bind(self, *args, **kwargs)
+        call.apply_defaults()
+        arguments = call.arguments
+        cacheable = (
+            use_cache
+            and arguments["temperature"] == 0
+            and self.supports_temperature(arguments["model"])
+            and not arguments["max_tokens"]
+            and not arguments["kwargs"]
+        )
+        return cacheable, arguments["model"], arguments["prompt"], arguments["system_prompt"]
+
+    def cached(model, text):
+        return ProviderResponse(
+            text=text, model=model, input_tokens=0, output_tokens=0,
+            cost=Decimal("0"), cached=True, cost_picodollars=0,
+        )
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            cacheable, model, prompt, system_prompt = cache_args(self, args, kwargs)
+            if not cacheable:
+                return await func(self, *args, **kwargs)
+
+            text = get_cached_response(model, prompt, system_prompt)
+            if text is not None:
+                return cached(model, text)
+
+            response = await func(self, *args, **kwargs)
+            # Cache in a worker thread so the disk write doesn't stall the event loop
+            await asyncio.to_thread(cache_response, model, prompt, response.text, system_prompt)
+            return response
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        cacheable, model, prompt, system_prompt = cache_args(self, args, kwargs)
+        if not cacheable:
+            return func(self, *args, **kwargs)
+
+        text = get_cached_response(model, prompt, system_prompt)
+        if text is not None:
+            return cached(model, text)
+
+        response = func(self, *args, **kwargs)
+        cache_response(model, prompt, response.text, system_prompt)
+        return response
+
+    return wrapper
+
+
+def single_flight(func):
+    """
+    Decorator coalescing identical concurrent calls to an async provider method.
+
+    While a call is in flight, another call on the same provider with the same
+    arguments awaits it instead of sending a second request. Followers get a copy of
+    the response marked cached with zero cost, since only the first call is billed.
+    """
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        key = (loop, self, func.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            task = _INFLIGHT.get(key)
+        except TypeError:
+            # Unhashable arguments (e.g. dict-valued kwargs) - don't coalesce
+            return await func(self, *args, **kwargs)
+
+        if task is not None:
+            # Shielded so a cancelled follower doesn't cancel the shared call
+            response = await asyncio.shield(task)
+            return dataclasses.replace(
+                response, cost=Decimal("0"), cached=True, cost_picodollars=0
+            )
+
+        task = loop.create_task(func(self, *args, **kwargs))
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+        return await task
+
+    return wrapper
+
+
+def rate_limited(func):
+    """
+    Decorator capping concurrent calls to an async provider method per model.
+
+    Each model gets a semaphore sized to half its requests-per-minute limit (the
+    model info's "rpm", or DEFAULT_RPM), so a burst of callers queues client-side
+    instead of tripping the server's rate limit and spending retries on 429s.
+    """
+    signature = inspect.signature(func)
+    default_model = signature.parameters["model"].default
+
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        model = signature.bind(self, *args, **kwargs).arguments.get("model", default_model)
+        semaphores = _SEMAPHORES.setdefault(asyncio.get_running_loop(), {})
+        key = (type(self), model)
+        semaphore = semaphores.get(key)
+        if semaphore is None:
+            rpm = self.get_model_info(model).get("rpm") or DEFAULT_RPM
+            semaphore = semaphores[key] = asyncio.Semaphore(max(1, rpm // 2))
+
+        async with semaphore:
+            return await func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def pricing_cache(func):
+    """
+    Decorator memoizing a function of the model pricing (e.g. a model info builder).
+
+    Results are kept until the pricing file changes, i.e. until load_pricing()
+    returns a new pricing dict. Dict results are cached as read-only views (nested
+    dicts included), so callers can't corrupt the cache or the loaded pricing.
+    """
+    @lru_cache(maxsize=64)
+    def cached(*args):
+        return _read_only(func(*args))
+
+    _PRICING_CACHES.append(cached)
+
+    @wraps(func)
+    def wrapper(*args):
+        _sync_pricing()
+        return cached(*args)
+
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+def _read_only(value):
+    """Wrap a dict (and the dicts nested in it) in read-only MappingProxyType views."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _read_only(item) for key, item in value.items()})
+    return value
+
+
+def _sync_pricing():
+    """Drop rates and pricing caches built from an outdated pricing dict."""
+    global _rates_pricing
+
+    pricing = load_pricing()
+    if pricing is not _rates_pricing:
+        _RATES_PICO.clear()
+        for cached in _PRICING_CACHES:
+            cached.cache_clear()
+        _rates_pricing = pricing
+
+
 class Provider(ABC):
     """
     Abstract base class for LLM providers.
@@ -110,8 +314,59 @@ class Provider(ABC):
         """
         pass
 
+    async def stream_complete_async(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        on_response: Optional[Callable[[ProviderResponse], None]] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Streaming completion request, yielding text chunks as they arrive.
+
+        Providers without a streaming API inherit this fallback, which yields the
+        whole completion as a single chunk.
+
+        Args:
+            prompt: User prompt/input
+            model: Model identifier
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens to generate
+            on_response: Called with the complete ProviderResponse (full text,
+                usage and cost) once the stream has finished
+            **kwargs: Provider-specific parameters
+
+        Yields:
+            Text chunks of the completion
+
+        Raises:
+            ProviderError: On API or configuration errors
+        """
+        response = await self.complete_async(
+            prompt, model, system_prompt, temperature, max_tokens, **kwargs
+        )
+        yield response.text
+        if on_response is not None:
+            on_response(response)
+
+    def supports_temperature(self, model: str) -> bool:
+        """
+        Check whether requests to a model are sent with the requested temperature.
+
+        Args:
+            model: Model identifier
+
+        Returns:
+            False if the temperature is dropped (the server default is used)
+        """
+        return True
+
     @abstractmethod
-    def get_model_info(self, model: str) -> dict:
+    def get_model_info(self, model: str) -> Mapping:
         """
         Get information about a specific model.
 
@@ -119,7 +374,7 @@ class Provider(ABC):
             model: Model identifier
 
         Returns:
-            Dictionary with model metadata (pricing, context window, etc.)
+            Mapping with model metadata (pricing, context window, etc.), possibly read-only
         """
         pass
 
@@ -135,16 +390,42 @@ class Provider(ABC):
         Returns:
             Estimated cost in USD
         """
-        model_info = self.get_model_info(model)
-        pricing = model_info.get("pricing", {})
+        cost = self.estimate_cost_picodollars(input_tokens, output_tokens, model)
+        return Decimal(cost) / PICODOLLARS_PER_DOLLAR
 
-        input_cost = (
-            Decimal(str(input_tokens)) * Decimal(str(pricing.get("input", 0))) / Decimal("1000000")
-        )
-        output_cost = (
-            Decimal(str(output_tokens))
-            * Decimal(str(pricing.get("output", 0)))
-            / Decimal("1000000")
-        )
+    def estimate_cost_picodollars(self, input_tokens: int, output_tokens: int, model: str) -> int:
+        """
+        Estimate the cost of a request in integer picodollars (1e-12 USD).
+
+        Cheaper than estimate_cost for accumulating totals; convert to USD only
+        for display.
+
+        Args:
+            input_tokens: Number of input tokens
+            output_tokens: Number of output tokens
+            model: Model identifier
+
+        Returns:
+            Estimated cost in picodollars
+        """
+        if not input_tokens and not output_tokens:
+            return 0
+
+        input_rate, output_rate = self._token_rates(model)
+        return input_rate * input_tokens + output_rate * output_tokens
+
+    def _token_rates(self, model: str) -> tuple:
+        """Get (input, output) per-token picodollar rates for a model."""
+        _sync_pricing()
 
-        return input_cost + output_cost
+        key = (type(self), model)
+        rates = _RATES_PICO.get(key)
+        if rates is None:
+            model_pricing = self.get_model_info(model).get("pricing") or {}
+            # Prices are USD per 1M tokens, i.e. 1e6 picodollars per token per USD
+            rates = (
+                round(Decimal(str(model_pricing.get("input", 0))) * 1_000_000),
+                round(Decimal(str(model_pricing.get("output", 0))) * 1_000_000),
+            )
+            _RATES_PICO[key] = rates
+        return rates
@@ -1,12 +1,26 @@
 """Google (Gemini) provider implementation."""
 
+import asyncio
 import os
-from typing import Optional
+from typing import Mapping, Optional
 
 from claude_mm.pricing import get_model_pricing
 from claude_mm.retry import retry_with_backoff
 
-from .base import Provider, ProviderError, ProviderResponse
+from .base import (
+    Provider,
+    ProviderError,
+    ProviderResponse,
+    cached_completion,
+    pricing_cache,
+    rate_limited,
+    single_flight,
+)
+
+try:
+    from google import genai
+except ImportError:
+    genai = None
 
 
 class GoogleProvider(Provider):
@@ -32,6 +46,20 @@ class GoogleProvider(Provider):
                 "Set via environment or pass to constructor."
             )
 
+        # Created on first use and reused so requests share one connection pool
+        self._client = None
+
+    def _get_client(self):
+        """Get the (lazily created) Gemini client."""
+        if self._client is None:
+            if genai is None:
+                raise ProviderError(
+                    "google-genai package not installed. Run: pip install google-genai"
+                )
+            self._client = genai.Client(api_key=self.api_key)
+        return self._client
+
+    @cached_completion
     @retry_with_backoff(max_attempts=3, initial_delay=1, max_delay=10)
     def complete(
         self,
@@ -56,14 +84,7 @@ class GoogleProvider(Provider):
         Returns:
             ProviderResponse with completion and usage
         """
-        import importlib.util
-        if importlib.util.find_spec("google.genai") is None:
-            raise ProviderError(
-                "google-genai package not installed. Run: pip install google-genai"
-            )
-
-        from google import genai
-        client = genai.Client(api_key=self.api_key)
+        client = self._get_client()
 
         # Gemini combines system and user prompts
         full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
@@ -88,27 +109,27 @@ class GoogleProvider(Provider):
             response = client.models.generate_content(**params)
 
             # Extract usage info
-            input_tokens = 0
-            output_tokens = 0
-            if hasattr(response, 'usage_metadata') and response.usage_metadata:
-                input_tokens = response.usage_metadata.prompt_token_count
-                output_tokens = response.usage_metadata.candidates_token_count
+            usage = getattr(response, "usage_metadata", None)
+            input_tokens = usage.prompt_token_count if usage else 0
+            output_tokens = usage.candidates_token_count if usage else 0
 
             # Calculate cost
-            cost = self.estimate_cost(input_tokens, output_tokens, model)
+            cost = self.estimate_cost_picodollars(input_tokens, output_tokens, model)
 
             return ProviderResponse(
                 text=response.text,
                 model=model,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
-                cost=cost,
                 cached=False,
+                cost_picodollars=cost,
             )
 
         except Exception as e:
             raise ProviderError(f"Google Gemini API error: {e}")
 
+    @single_flight
+    @rate_limited
     async def complete_async(
         self,
         prompt: str,
@@ -132,24 +153,31 @@ class GoogleProvider(Provider):
         Returns:
             ProviderResponse with completion and usage
         """
-        import importlib.util
-        if importlib.util.find_spec("google.genai") is None:
+        if genai is None:
             raise ProviderError(
                 "google-genai package not installed. Run: pip install google-genai"
             )
 
-        # Note: google-genai doesn't have native async support yet
-        # We'll use the sync method for now and wrap it if needed
-        # This is a known limitation we can address when google-genai adds async
-        return self.complete(prompt, model, system_prompt, temperature, max_tokens, **kwargs)
+        # Run the sync call in a worker thread so it doesn't block the event loop
+        # (and concurrent Gemini requests overlap)
+        return await asyncio.to_thread(
+            self.complete, prompt, model, system_prompt, temperature, max_tokens, **kwargs
+        )
 
-    def get_model_info(self, model: str) -> dict:
+    def get_model_info(self, model: str) -> Mapping:
         """Get Google Gemini model information."""
-        pricing = get_model_pricing("google", model)
-
-        return {
-            "provider": "google",
-            "model": model,
-            "pricing": pricing,
-            "context_window": 1000000,  # 1M tokens for Gemini models
-        }
+        return _google_info(model)
+
+
+@pricing_cache
+def _google_info(model: str) -> dict:
+    """Build Google Gemini model information (memoized per model)."""
+    pricing = get_model_pricing("google", model)
+
+    return {
+        "provider": "google",
+        "model": model,
+        "pricing": pricing,
+        "rpm": (pricing or {}).get("rpm"),
+        "context_window": 1000000,  # 1M tokens for Gemini models
+    }
@@ -1,12 +1,34 @@
 """OpenAI provider implementation."""
 
+import asyncio
 import os
-from typing import Optional
+import weakref
+from typing import AsyncIterator, Callable, Mapping, Optional
 
 from claude_mm.pricing import get_model_pricing
 from claude_mm.retry import retry_with_backoff
 
-from .base import Provider, ProviderError, ProviderResponse
+from ._http import get_async_http
+from .base import (
+    Provider,
+    ProviderError,
+    ProviderResponse,
+    cached_completion,
+    pricing_cache,
+    rate_limited,
+    single_flight,
+)
+
+try:
+    from openai import AsyncOpenAI, OpenAI
+except ImportError:
+    OpenAI = None
+    AsyncOpenAI = None
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant."
+
+# Built once and shared by requests using the default prompt (the SDK doesn't mutate it)
+_DEFAULT_SYSTEM_MESSAGE = {"role": "system", "content": DEFAULT_SYSTEM_PROMPT}
 
 
 class OpenAIProvider(Provider):
@@ -32,6 +54,36 @@ class OpenAIProvider(Provider):
                 "Set via environment or pass to constructor."
             )
 
+        # Clients are created on first use and reused so requests share one connection
+        # pool. Async clients are bound to the event loop they were created on and
+        # share that loop's HTTP pool with the other providers.
+        self._client = None
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _get_client(self):
+        """Get the (lazily created) sync client."""
+        if self._client is None:
+            if OpenAI is None:
+                raise ProviderError(
+                    "openai package not installed. Run: pip install openai"
+                )
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
+
+    def _get_async_client(self):
+        """Get the (lazily created) async client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            if AsyncOpenAI is None:
+                raise ProviderError(
+                    "openai package not installed. Run: pip install openai"
+                )
+            client = AsyncOpenAI(api_key=self.api_key, http_client=get_async_http())
+            self._async_clients[loop] = client
+        return client
+
+    @cached_completion
     @retry_with_backoff(max_attempts=3, initial_delay=1, max_delay=10)
     def complete(
         self,
@@ -56,57 +108,34 @@ class OpenAIProvider(Provider):
         Returns:
             ProviderResponse with completion and usage
         """
-        try:
-            from openai import OpenAI
-        except ImportError:
-            raise ProviderError(
-                "openai package not installed. Run: pip install openai"
-            )
+        client = self._get_client()
 
-        client = OpenAI(api_key=self.api_key)
-
-        if not system_prompt:
-            system_prompt = "You are a helpful AI assistant."
+        params = self._make_params(prompt, model, system_prompt, temperature, max_tokens, kwargs)
 
         try:
-            # Build request parameters
-            params = {
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-            }
-
-            # GPT-5.2 models don't support temperature parameter
-            if not model.startswith("gpt-5"):
-                params["temperature"] = temperature
-
-            if max_tokens:
-                params["max_tokens"] = max_tokens
-
-            # Add any additional parameters
-            params.update(kwargs)
-
             response = client.chat.completions.create(**params)
 
             # Calculate cost
-            input_tokens = response.usage.prompt_tokens if response.usage else 0
-            output_tokens = response.usage.completion_tokens if response.usage else 0
-            cost = self.estimate_cost(input_tokens, output_tokens, model)
+            usage = response.usage
+            input_tokens = usage.prompt_tokens if usage else 0
+            output_tokens = usage.completion_tokens if usage else 0
+            cost = self.estimate_cost_picodollars(input_tokens, output_tokens, model)
 
             return ProviderResponse(
                 text=response.choices[0].message.content,
                 model=model,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
-                cost=cost,
                 cached=False,
+                cost_picodollars=cost,
             )
 
         except Exception as e:
             raise ProviderError(f"OpenAI API error: {e}")
 
+    @cached_completion
+    @single_flight
+    @rate_limited
     async def complete_async(
         self,
         prompt: str,
@@ -130,64 +159,140 @@ class OpenAIProvider(Provider):
         Returns:
             ProviderResponse with completion and usage
         """
-        try:
-            from openai import AsyncOpenAI
-        except ImportError:
-            raise ProviderError(
-                "openai package not installed. Run: pip install openai"
-            )
+        client = self._get_async_client()
 
-        client = AsyncOpenAI(api_key=self.api_key)
-
-        if not system_prompt:
-            system_prompt = "You are a helpful AI assistant."
+        params = self._make_params(prompt, model, system_prompt, temperature, max_tokens, kwargs)
 
         try:
-            # Build request parameters
-            params = {
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-            }
-
-            # GPT-5.2 models don't support temperature parameter
-            if not model.startswith("gpt-5"):
-                params["temperature"] = temperature
-
-            if max_tokens:
-                params["max_tokens"] = max_tokens
-
-            # Add any additional parameters
-            params.update(kwargs)
-
             response = await client.chat.completions.create(**params)
 
             # Calculate cost
-            input_tokens = response.usage.prompt_tokens if response.usage else 0
-            output_tokens = response.usage.completion_tokens if response.usage else 0
-            cost = self.estimate_cost(input_tokens, output_tokens, model)
+            usage = response.usage
+            input_tokens = usage.prompt_tokens if usage else 0
+            output_tokens = usage.completion_tokens if usage else 0
+            cost = self.estimate_cost_picodollars(input_tokens, output_tokens, model)
 
             return ProviderResponse(
                 text=response.choices[0].message.content,
                 model=model,
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
-                cost=cost,
                 cached=False,
+                cost_picodollars=cost,
             )
 
         except Exception as e:
             raise ProviderError(f"OpenAI API error: {e}")
 
-    def get_model_info(self, model: str) -> dict:
-        """Get OpenAI model information."""
-        pricing = get_model_pricing("openai", model)
+    async def stream_complete_async(
+        self,
+        prompt: str,
+        model: str = "gpt-5.2",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        on_response: Optional[Callable[[ProviderResponse], None]] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Streaming OpenAI completion.
 
-        return {
-            "provider": "openai",
+        Args:
+            prompt: User prompt
+            model: Model identifier
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            on_response: Called with the complete ProviderResponse once the stream ends
+            **kwargs: Additional OpenAI parameters
+
+        Yields:
+            Text chunks of the completion
+        """
+        client = self._get_async_client()
+
+        # Usage arrives in a final chunk with no choices
+        params = self._make_params(
+            prompt, model, system_prompt, temperature, max_tokens,
+            {"stream": True, "stream_options": {"include_usage": True}, **kwargs},
+        )
+
+        parts = []
+        usage = None
+        try:
+            stream = await client.chat.completions.create(**params)
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    text = chunk.choices[0].delta.content
+                    parts.append(text)
+                    yield text
+        except Exception as e:
+            raise ProviderError(f"OpenAI API error: {e}")
+
+        if on_response is not None:
+            input_tokens = usage.prompt_tokens if usage else 0
+            output_tokens = usage.completion_tokens if usage else 0
+            cost = self.estimate_cost_picodollars(input_tokens, output_tokens, model)
+            on_response(ProviderResponse(
+                text="".join(parts),
+                model=model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cached=False,
+                cost_picodollars=cost,
+            ))
+
+    def _make_params(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        extra: dict,
+    ) -> dict:
+        """Build Chat Completions request parameters, with extra OpenAI parameters merged in."""
+        params = {
             "model": model,
-            "pricing": pricing,
-            "context_window": 128000 if model.startswith("gpt-5") else 8192,
+            "messages": [_system_message(system_prompt), {"role": "user", "content": prompt}],
         }
+
+        if self.supports_temperature(model):
+            params["temperature"] = temperature
+
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+
+        params.update(extra)
+        return params
+
+    def supports_temperature(self, model: str) -> bool:
+        """GPT-5.2 models don't support the temperature parameter."""
+        return not model.startswith("gpt-5")
+
+    def get_model_info(self, model: str) -> Mapping:
+        """Get OpenAI model information."""
+        return _openai_info(model)
+
+
+@pricing_cache
+def _openai_info(model: str) -> dict:
+    """Build OpenAI model information (memoized per model)."""
+    pricing = get_model_pricing("openai", model)
+
+    return {
+        "provider": "openai",
+        "model": model,
+        "pricing": pricing,
+        "rpm": (pricing or {}).get("rpm"),
+        "context_window": 128000 if model.startswith("gpt-5") else 8192,
+    }
+
+
+def _system_message(system_prompt: Optional[str]) -> dict:
+    """Get the system message for a request, reusing the default one when possible."""
+    if not system_prompt:
+        return _DEFAULT_SYSTEM_MESSAGE
+    return {"role": "system", "content": system_prompt}
@@ -5,26 +5,135 @@ Simple retry logic with exponential backoff.
 Provides retry decorators for API calls without external dependencies.
 """
 
-import sys
+import logging
+import random
+import re
 import time
 from functools import wraps
 
+logger = logging.getLogger(__name__)
 
-def retry_with_backoff(max_attempts=3, initial_delay=1, max_delay=10, backoff_factor=2):
+# Errors worth retrying regardless of what they say
+RETRYABLE_ERRORS = (TimeoutError, ConnectionError)
+
+# HTTP statuses retrying can't fix: bad request, authentication and permission errors
+NON_RETRYABLE_STATUS = frozenset({400, 401, 403, 404})
+
+# Message fallbacks for errors without a status code: authentication/config errors,
+# which retrying can't fix, and rate limits
+_NO_RETRY_RE = re.compile(r"api key|authentication|unauthorized|invalid", re.I)
+_RATE_LIMIT_RE = re.compile(r"429|rate limit", re.I)
+
+# "Retry-After: 12" / "retry after 1.5" etc. in an error message
+_RETRY_AFTER_RE = re.compile(r"retry[- ]after[:=\s]+(\d+(?:\.\d+)?)", re.I)
+
+
+def _retry_after(exc):
+    """
+    Get the server-requested retry delay in seconds for an error, if it has one.
+
+    Checks the Retry-After header of the SDK error (or the error it was raised
+    from, since providers wrap SDK errors in ProviderError), then the message.
+    """
+    err = exc
+    while err is not None:
+        response = getattr(err, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            try:
+                return float(headers.get("retry-after"))
+            except (TypeError, ValueError):
+                pass
+        err = err.__cause__ or err.__context__
+
+    match = _RETRY_AFTER_RE.search(str(exc))
+    return float(match.group(1)) if match else None
+
+
+def _status_code(exc):
+    """
+    Get the HTTP status code of an error, if it has one.
+
+    Checks the SDK error's status_code (or its response's), following the chain of
+    errors it was raised from like _retry_after.
+    """
+    err = exc
+    while err is not None:
+        status = getattr(err, "status_code", None)
+        if status is None:
+            status = getattr(getattr(err, "response", None), "status_code", None)
+        if isinstance(status, int):
+            return status
+        err = err.__cause__ or err.__context__
+    return None
+
+
+def _classify(exc, retryable, non_retryable_status):
+    """
+    Classify an error as "no_retry", "rate_limit" or "retry".
+
+    Dispatches on the error type and HTTP status first; only errors carrying
+    neither are classified by matching their message.
+    """
+    err = exc
+    while err is not None:
+        if isinstance(err, retryable):
+            return "retry"
+        err = err.__cause__ or err.__context__
+
+    status = _status_code(exc)
+    if status is not None:
+        if status == 429:
+            return "rate_limit"
+        if status in non_retryable_status:
+            return "no_retry"
+        return "retry"
+
+    error_msg = str(exc)
+    if _NO_RETRY_RE.search(error_msg):
+        return "no_retry"
+    if _RATE_LIMIT_RE.search(error_msg):
+        return "rate_limit"
+    return "retry"
+
+
+def retry_with_backoff(
+    max_attempts=3,
+    initial_delay=1,
+    max_delay=10,
+    backoff_factor=2,
+    jitter=True,
+    retryable=RETRYABLE_ERRORS,
+    non_retryable_status=NON_RETRYABLE_STATUS,
+):
     """
     Decorator to retry a function with exponential backoff.
 
+    With jitter (the default), delays are decorrelated: each is drawn between
+    initial_delay and three times the previous delay, so concurrent callers hitting
+    the same rate limit don't retry in lockstep. A Retry-After from the server is
+    honored instead, up to max_delay.
+
+    Errors are classified by type and HTTP status code (of the error or the SDK
+    error it wraps); the message is only inspected for errors with neither.
+
     Args:
         max_attempts: Maximum number of retry attempts
         initial_delay: Initial delay in seconds
         max_delay: Maximum delay in seconds
-        backoff_factor: Multiplier for delay between attempts
+        backoff_factor: Multiplier for delay between attempts (without jitter)
+        jitter: Randomize delays (decorrelated jitter)
+        retryable: Exception types that are always retried
+        non_retryable_status: HTTP status codes that are never retried
 
     Example:
         @retry_with_backoff(max_attempts=3)
         def call_api():
             ...
     """
+    retryable = tuple(retryable)
+    non_retryable_status = frozenset(non_retryable_status)
+
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -38,33 +147,38 @@ def retry_with_backoff(max_attempts=3, initial_delay=1, max_delay=10, backoff_fa
                     last_exception = e
 
                     # Don't retry on certain errors
-                    error_msg = str(e).lower()
-                    if any(
-                        x in error_msg
-                        for x in ['api key', 'authentication', 'unauthorized', 'invalid']
-                    ):
+                    kind = _classify(e, retryable, non_retryable_status)
+                    if kind == "no_retry":
                         # Authentication/config errors - don't retry
                         raise
 
                     if attempt < max_attempts:
+                        if jitter:
+                            delay = min(max_delay, random.uniform(initial_delay, delay * 3))
+                        sleep_for = _retry_after(e)
+                        if sleep_for is None:
+                            sleep_for = delay
+                        else:
+                            # Never block longer than max_delay, whatever the server asks
+                            sleep_for = min(max(sleep_for, 0), max_delay)
+
                         # Check if it's a rate limit error
-                        if '429' in error_msg or 'rate limit' in error_msg:
-                            print(
-                                f"⏸️  Rate limited. Retrying in {delay}s... "
-                                f"(attempt {attempt}/{max_attempts})",
-                                file=sys.stderr
+                        if kind == "rate_limit":
+                            logger.warning(
+                                "⏸️  Rate limited. Retrying in %.1fs... (attempt %d/%d)",
+                                sleep_for, attempt, max_attempts,
                             )
                         else:
-                            print(
-                                f"⚠️  API call failed: {e}. Retrying in {delay}s... "
-                                f"(attempt {attempt}/{max_attempts})",
-                                file=sys.stderr
+                            logger.warning(
+                                "⚠️  API call failed: %s. Retrying in %.1fs... (attempt %d/%d)",
+                                e, sleep_for, attempt, max_attempts,
                             )
 
-                        time.sleep(delay)
-                        delay = min(delay * backoff_factor, max_delay)
+                        time.sleep(sleep_for)
+                        if not jitter:
+                            delay = min(delay * backoff_factor, max_delay)
                     else:
-                        print(f"❌ API call failed after {max_attempts} attempts", file=sys.stderr)
+                        logger.warning("❌ API call failed after %d attempts", max_attempts)
 
             # If we've exhausted all retries, raise the last exception
             raise last_exception
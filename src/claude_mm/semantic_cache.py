@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Semantic (near-duplicate) response caching.
+
+Optional tier behind the exact-match cache in cache.py. Prompts are embedded with a
+small local model and stored in an hnswlib index, so a rephrased request can reuse the
+response cached for a near-identical earlier prompt instead of paying for an API call.
+
+Requires the optional 'semantic' extra (pip install claude-mm-tool[semantic]) and is
+enabled with `semantic_cache: true` in ~/.config/ai/config.yaml. hnswlib and
+sentence-transformers (which pulls in torch) are only imported on first use, so
+installing the extra doesn't slow down startup when the tier is disabled.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Small, fast local embedding model (384 dimensions)
+EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
+EMBEDDING_DIM = 384
+
+# Nearest neighbours checked per lookup (matches for other models/system prompts are skipped)
+_QUERY_K = 8
+_INITIAL_CAPACITY = 1024
+
+_encoder = None
+_indexes: Dict[Path, "SemanticIndex"] = {}
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def is_available() -> bool:
+    """Check whether the optional semantic cache dependencies are installed (not importing them)."""
+    return all(
+        importlib.util.find_spec(name) is not None
+        for name in ("hnswlib", "sentence_transformers")
+    )
+
+
+def _namespace(model: str, system_prompt: str = None) -> str:
+    """Key grouping prompts that may share responses (same model and system prompt)."""
+    content = f"{model}:{system_prompt or ''}"
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+def _embed(text: str):
+    """Embed text as a normalized vector, loading the model on first use."""
+    global _encoder
+    if _encoder is None:
+        from sentence_transformers import SentenceTransformer
+
+        _encoder = SentenceTransformer(EMBEDDING_MODEL)
+    return _encoder.encode([text], normalize_embeddings=True)
+
+
+class SemanticIndex:
+    """Persistent hnswlib index mapping prompt embeddings to exact-match cache keys."""
+
+    def __init__(self, index_dir: Path):
+        import hnswlib
+
+        self.index_dir = index_dir
+        self.index_path = index_dir / "index.bin"
+        self.entries_path = index_dir / "entries.json"
+
+        # Label (position) -> [namespace, cache_key]
+        self.entries: List[list] = []
+        self.index = hnswlib.Index(space="cosine", dim=EMBEDDING_DIM)
+
+        if self.index_path.exists() and self.entries_path.exists():
+            try:
+                self.entries = json.loads(self.entries_path.read_text())
+                self.index.load_index(
+                    str(self.index_path),
+                    max_elements=max(len(self.entries), _INITIAL_CAPACITY),
+                )
+                self.index.set_ef(50)
+                return
+            except Exception:
+                # Corrupt or incompatible index - start over
+                self.entries = []
+                self.index = hnswlib.Index(space="cosine", dim=EMBEDDING_DIM)
+
+        self.index.init_index(max_elements=_INITIAL_CAPACITY, ef_construction=200, M=16)
+        self.index.set_ef(50)
+
+    def add(self, vector, namespace: str, cache_key: str) -> None:
+        """Add an embedding and persist the index."""
+        if len(self.entries) >= self.index.get_max_elements():
+            self.index.resize_index(len(self.entries) * 2)
+
+        self.index.add_items(vector, [len(self.entries)])
+        self.entries.append([namespace, cache_key])
+        self._save()
+
+    def query(self, vector, namespace: str, threshold: float) -> Optional[str]:
+        """Return the cache key of the closest match above threshold, if any."""
+        if not self.entries:
+            return None
+
+        k = min(_QUERY_K, len(self.entries))
+        labels, distances = self.index.knn_query(vector, k=k)
+
+        # Results are sorted nearest first; cosine space returns 1 - similarity
+        for label, distance in zip(labels[0], distances[0]):
+            if 1.0 - distance < threshold:
+                break
+            if label >= len(self.entries):
+                continue
+            entry_namespace, cache_key = self.entries[label]
+            if entry_namespace == namespace:
+                return cache_key
+
+        return None
+
+    def _save(self) -> None:
+        """Persist the index and its entries using atomic renames."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        tmp_index = self.index_path.with_suffix(".tmp")
+        self.index.save_index(str(tmp_index))
+        os.replace(tmp_index, self.index_path)
+
+        tmp_entries = self.entries_path.with_suffix(".tmp")
+        tmp_entries.write_text(json.dumps(self.entries))
+        os.replace(tmp_entries, self.entries_path)
+
+
+def _get_index(cache_dir: Path) -> SemanticIndex:
+    """Get the (lazily loaded) index for a cache directory. Caller holds _lock."""
+    index = _indexes.get(cache_dir)
+    if index is None:
+        index = SemanticIndex(cache_dir / "semantic")
+        _indexes[cache_dir] = index
+    return index
+
+
+def lookup(
+    cache_dir: Path, model: str, prompt: str, system_prompt: str = None, threshold: float = 0.92
+) -> Optional[str]:
+    """
+    Find the cache key of a semantically similar earlier prompt.
+
+    Args:
+        cache_dir: Response cache directory
+        model: Model name
+        prompt: User prompt
+        system_prompt: System prompt (optional)
+        threshold: Minimum cosine similarity for a match
+
+    Returns:
+        Cache key of the matching entry, or None
+    """
+    with _lock:
+        index = _get_index(cache_dir)
+        return index.query(_embed(prompt), _namespace(model, system_prompt), threshold)
+
+
+def add(
+    cache_dir: Path, model: str, prompt: str, cache_key: str, system_prompt: str = None
+) -> None:
+    """
+    Record a cached prompt so similar future prompts can find it.
+
+    Args:
+        cache_dir: Response cache directory
+        model: Model name
+        prompt: User prompt
+        cache_key: Exact-match cache key the response is stored under
+        system_prompt: System prompt (optional)
+    """
+    with _lock:
+        index = _get_index(cache_dir)
+        index.add(_embed(prompt), _namespace(model, system_prompt), cache_key)
+
+
+def reset(cache_dir: Path) -> None:
+    """Drop the semantic index for a cache directory."""
+    with _lock:
+        _indexes.pop(cache_dir, None)
+        for name in ("index.bin", "entries.json"):
+            (cache_dir / "semantic" / name).unlink(missing_ok=True)
@@ -3,14 +3,42 @@
 Cost logging and usage tracking for AI API calls.
 
 Provides persistent logging of API usage with cost tracking and statistics.
+
+Log entries are queued and appended by a background writer thread, so API calls
+never wait on log file I/O. Pending entries are flushed at exit and before stats
+are read.
 """
 
+import atexit
 import fcntl
 import json
+import logging
 import os
-from datetime import datetime, timedelta
+import queue
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Pending log lines: (log path, JSON line)
+_LOG_QUEUE: "queue.Queue[tuple[Path, str]]" = queue.Queue()
+_LOG_BATCH_SIZE = 100
+
+# Bytes from the start of the log stored in the summary snapshot to recognize the file
+_SNAPSHOT_HEAD_BYTES = 128
+
+_writer_thread = None
+_writer_lock = threading.Lock()
+
 
 def get_cost_log_path() -> Path:
     """Get the path to the cost log file."""
@@ -27,7 +55,9 @@ def log_api_call(
     operation: str = "unknown"
 ) -> None:
     """
-    Log an API call to the cost tracking file with file locking.
+    Log an API call to the cost tracking file.
+
+    The entry is queued and written by the background writer thread.
 
     Args:
         model: Model name used
@@ -38,8 +68,10 @@ def log_api_call(
     """
     log_path = get_cost_log_path()
 
+    now = time.time()
     entry = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.fromtimestamp(now).isoformat(),
+        "ts": now,  # Epoch seconds, for cheap date filtering in get_usage_stats()
         "model": model,
         "operation": operation,
         "input_tokens": input_tokens,
@@ -47,35 +79,106 @@ def log_api_call(
         "cost": round(cost, 6),
     }
 
+    _LOG_QUEUE.put((log_path, json.dumps(entry) + "\n"))
+    _ensure_writer()
+
+
+def flush_log() -> None:
+    """Write all queued log entries to disk (blocks until done)."""
+    # Write whatever is still queued ourselves (the writer may not be running,
+    # e.g. during interpreter shutdown), then wait for any batch it holds
+    while True:
+        batch = _take_batch(block=False)
+        if not batch:
+            break
+        _write_batch(batch)
+    _LOG_QUEUE.join()
+
+
+def _ensure_writer() -> None:
+    """Start the background writer thread if it isn't running."""
+    global _writer_thread
+
+    if _writer_thread is not None and _writer_thread.is_alive():
+        return
+
+    with _writer_lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(
+                target=_writer_loop, name="claude-mm-usage-log", daemon=True
+            )
+            _writer_thread.start()
+
+
+def _writer_loop() -> None:
+    """Background writer: append queued entries in batches."""
+    while True:
+        _write_batch(_take_batch(block=True))
+
+
+def _take_batch(block: bool) -> list:
+    """Take up to _LOG_BATCH_SIZE queued entries."""
+    batch = []
+    try:
+        batch.append(_LOG_QUEUE.get(block=block))
+        while len(batch) < _LOG_BATCH_SIZE:
+            batch.append(_LOG_QUEUE.get_nowait())
+    except queue.Empty:
+        pass
+    return batch
+
+
+def _write_batch(batch: list) -> None:
+    """Append a batch of entries, one open + lock per log file."""
+    by_path = {}
+    for log_path, line in batch:
+        by_path.setdefault(log_path, []).append(line)
+
     try:
-        # Use file locking to prevent corruption from concurrent writes
-        with open(log_path, "a") as f:
-            # Acquire exclusive lock (blocks until available)
-            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        for log_path, lines in by_path.items():
             try:
-                f.write(json.dumps(entry) + "\n")
-                f.flush()
-                os.fsync(f.fileno())
-            finally:
-                # Release lock
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-    except Exception as e:
-        # Don't fail the operation if logging fails
-        import sys
-        print(f"Warning: Failed to log cost: {e}", file=sys.stderr)
+                # Use file locking to prevent corruption from concurrent writes
+                with open(log_path, "a") as f:
+                    # Acquire exclusive lock (blocks until available)
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                    try:
+                        f.writelines(lines)
+                        f.flush()
+                    finally:
+                        # Release lock
+                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            except Exception as e:
+                # Don't fail the operation if logging fails
+                logger.warning("Failed to log cost: %s", e)
+    finally:
+        for _ in batch:
+            _LOG_QUEUE.task_done()
+
+
+atexit.register(flush_log)
+
+
+def get_summary_path() -> Path:
+    """Get the path to the all-time usage summary snapshot."""
+    return get_cost_log_path().with_name("costs.summary.json")
 
 
 def get_usage_stats(days: int = None) -> dict:
     """
     Get usage statistics from the cost log.
 
+    All-time stats are kept in a summary snapshot next to the log, so only
+    entries appended since the last call are parsed. Windowed stats scan the
+    whole log.
+
     Args:
         days: Number of days to look back (None = all time)
 
     Returns:
         Dictionary with usage statistics
     """
-    import sys
+    # Make sure entries logged by this process are included
+    flush_log()
 
     log_path = get_cost_log_path()
     if not log_path.exists():
@@ -86,49 +189,133 @@ def get_usage_stats(days: int = None) -> dict:
             "by_operation": {},
         }
 
-    cutoff_date = None
-    if days is not None:
-        cutoff_date = datetime.now() - timedelta(days=days)
-
-    total_cost = 0
-    total_calls = 0
-    by_model = {}
-    by_operation = {}
+    totals = _empty_totals()
 
     try:
-        with open(log_path) as f:
-            for line in f:
-                entry = json.loads(line.strip())
-                timestamp = datetime.fromisoformat(entry["timestamp"])
-
-                # Skip if outside date range
-                if cutoff_date and timestamp < cutoff_date:
-                    continue
-
-                cost = entry["cost"]
-                model = entry["model"]
-                operation = entry.get("operation", "unknown")
-
-                total_cost += cost
-                total_calls += 1
-
-                # By model
-                if model not in by_model:
-                    by_model[model] = {"cost": 0, "calls": 0}
-                by_model[model]["cost"] += cost
-                by_model[model]["calls"] += 1
-
-                # By operation
-                if operation not in by_operation:
-                    by_operation[operation] = {"cost": 0, "calls": 0}
-                by_operation[operation]["cost"] += cost
-                by_operation[operation]["calls"] += 1
+        if days is None:
+            _accumulate_all_time(log_path, totals)
+        else:
+            with open(log_path, "rb") as f:
+                _accumulate(f, totals, time.time() - days * 86400)
     except Exception as e:
-        print(f"Warning: Failed to read cost log: {e}", file=sys.stderr)
+        logger.warning("Failed to read cost log: %s", e)
 
     return {
-        "total_cost": round(total_cost, 4),
-        "total_calls": total_calls,
-        "by_model": by_model,
-        "by_operation": by_operation,
+        "total_cost": round(totals["total_cost"], 4),
+        "total_calls": totals["total_calls"],
+        "by_model": totals["by_model"],
+        "by_operation": totals["by_operation"],
     }
+
+
+def _empty_totals() -> dict:
+    """Fresh usage totals."""
+    return {"total_cost": 0, "total_calls": 0, "by_model": {}, "by_operation": {}}
+
+
+def _accumulate(f, totals: dict, cutoff_ts: float = None) -> int:
+    """
+    Add log entries from the current position of a binary file to totals.
+
+    Args:
+        f: Log file opened in binary mode
+        totals: Totals to add to (see _empty_totals)
+        cutoff_ts: Skip entries older than this (epoch seconds)
+
+    Returns:
+        Byte offset just past the last complete line read
+    """
+    offset = f.tell()
+    by_model = totals["by_model"]
+    by_operation = totals["by_operation"]
+
+    # Local names keep attribute lookups out of the per-line loop
+    loads = _loads
+    fromisoformat = datetime.fromisoformat
+
+    for line in f:
+        if not line.endswith(b"\n"):
+            # Partial line still being written by another process
+            break
+        offset += len(line)
+        if not line.strip():
+            continue
+
+        entry = loads(line)
+
+        # Skip if outside date range (entries written before "ts" only have the ISO string)
+        if cutoff_ts is not None:
+            ts = entry.get("ts")
+            if ts is None:
+                ts = fromisoformat(entry["timestamp"]).timestamp()
+            if ts < cutoff_ts:
+                continue
+
+        cost = entry["cost"]
+        model = entry["model"]
+        operation = entry.get("operation", "unknown")
+
+        totals["total_cost"] += cost
+        totals["total_calls"] += 1
+
+        # By model
+        if model not in by_model:
+            by_model[model] = {"cost": 0, "calls": 0}
+        by_model[model]["cost"] += cost
+        by_model[model]["calls"] += 1
+
+        # By operation
+        if operation not in by_operation:
+            by_operation[operation] = {"cost": 0, "calls": 0}
+        by_operation[operation]["cost"] += cost
+        by_operation[operation]["calls"] += 1
+
+    return offset
+
+
+def _accumulate_all_time(log_path: Path, totals: dict) -> None:
+    """Fill all-time totals from the summary snapshot plus any newer log entries."""
+    summary_path = get_summary_path()
+    st = log_path.stat()
+
+    offset = 0
+    snapshot = None
+    try:
+        snapshot = json.loads(summary_path.read_text())
+    except (OSError, ValueError):
+        pass
+
+    with open(log_path, "rb") as f:
+        # The first bytes of the log identify it alongside the inode (inodes get reused)
+        head = f.read(_SNAPSHOT_HEAD_BYTES).decode("utf-8", "replace")
+
+        # Only trust the snapshot if it describes this log file (not a rotated/truncated one)
+        if (
+            isinstance(snapshot, dict)
+            and "totals" in snapshot
+            and snapshot.get("inode") == st.st_ino
+            and snapshot.get("head") == head
+            and snapshot.get("offset", 0) <= st.st_size
+        ):
+            offset = snapshot["offset"]
+            totals.update(snapshot["totals"])
+
+        f.seek(offset)
+        new_offset = _accumulate(f, totals)
+
+    if snapshot is None or new_offset != offset:
+        _save_snapshot(
+            summary_path,
+            {"inode": st.st_ino, "head": head, "offset": new_offset, "totals": totals},
+        )
+
+
+def _save_snapshot(summary_path: Path, snapshot: dict) -> None:
+    """Atomically write the summary snapshot."""
+    tmp_path = summary_path.with_suffix(".tmp")
+    try:
+        tmp_path.write_text(json.dumps(snapshot))
+        os.replace(tmp_path, summary_path)
+    except OSError:
+        # The snapshot is only an optimization; the log stays authoritative
+        tmp_path.unlink(missing_ok=True)
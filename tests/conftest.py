@@ -3,6 +3,14 @@
 import os
 
 import pytest
+from hypothesis import settings
+
+from claude_mm.models import list_all_aliases, list_all_models
+
+# Property-based tests sample a few aliases locally; HYPOTHESIS_PROFILE=ci covers them all
+settings.register_profile("dev", max_examples=25)
+settings.register_profile("ci", max_examples=len(list_all_aliases()))
+settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "dev"))
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -20,3 +28,15 @@ def mock_env_vars(monkeypatch):
     monkeypatch.setenv("OPENAI_API_KEY", "test-openai-key")
     monkeypatch.setenv("GOOGLE_AI_API_KEY", "test-google-key")
     monkeypatch.setenv("ANTHROPIC_API_KEY", "test-anthropic-key")
+
+
+@pytest.fixture(scope="session")
+def all_aliases():
+    """All registered model aliases, built once per session."""
+    return list_all_aliases()
+
+
+@pytest.fixture(scope="session")
+def all_models():
+    """All registered models by provider, built once per session."""
+    return list_all_models()
@@ -0,0 +1,226 @@
+"""Unit tests for api module."""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+
+from claude_mm import api
+from claude_mm.providers.base import ProviderResponse
+
+
+@pytest.mark.parametrize(
+    "env,config,expected",
+    [
+        (None, {}, 8),
+        (None, {"max_concurrent": 3}, 3),
+        ("5", {"max_concurrent": 3}, 5),
+        ("0", {}, 1),
+        ("-4", {}, 1),
+        ("lots", {}, 8),
+        (None, {"max_concurrent": 0}, 1),
+        (None, {"max_concurrent": "garbage"}, 8),
+    ],
+)
+def test_max_concurrent(monkeypatch, env, config, expected):
+    """Test the concurrency cap falls back on bad input and is at least 1."""
+    if env is None:
+        monkeypatch.delenv("CLAUDE_MM_MAX_CONC", raising=False)
+    else:
+        monkeypatch.setenv("CLAUDE_MM_MAX_CONC", env)
+
+    assert api._max_concurrent(config) == expected
+
+
+class StubProvider:
+    """Provider stand-in that records calls and can block or fail on demand."""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+        self.error = None
+        self.gate = None  # threading.Event (sync) or asyncio.Event (async) to wait on
+        self.delay = 0
+
+    def _response(self, prompt, model):
+        if self.error is not None:
+            raise self.error
+        return ProviderResponse(
+            text=f"{self.name}: {prompt}", model=model,
+            input_tokens=10, output_tokens=5, cost=Decimal("0.001"),
+        )
+
+    def complete(self, prompt, model, system_prompt=None):
+        self.calls.append(prompt)
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self._response(prompt, model)
+
+    async def complete_async(self, prompt, model, system_prompt=None):
+        self.calls.append(prompt)
+        if self.gate is not None:
+            await asyncio.wait_for(self.gate.wait(), 5)
+        await asyncio.sleep(self.delay)
+        return self._response(prompt, model)
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    """Replace providers, usage logging and the response cache with in-memory stubs."""
+    stubs = {name: StubProvider(name) for name in ("openai", "google", "anthropic")}
+    monkeypatch.setattr(api, "_get_default_provider", stubs.__getitem__)
+    monkeypatch.setattr(api, "log_api_call", lambda **kwargs: None)
+    monkeypatch.setattr(api, "get_cached_response", lambda *args, **kwargs: None)
+    monkeypatch.setattr(api, "cache_response", lambda *args, **kwargs: None)
+    return stubs
+
+
+def test_single_flight_coalesces_threads(providers):
+    """Test identical concurrent sync reviews share one provider call."""
+    provider = providers["openai"]
+    provider.gate = threading.Event()
+
+    with concurrent.futures.ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(api._review_single, "diff", "gpt", "system", True, 24)
+        while not api._INFLIGHT:
+            time.sleep(0.001)
+        follower = pool.submit(api._review_single, "diff", "gpt", "system", True, 24)
+        time.sleep(0.05)  # Let the follower find the in-flight call
+        provider.gate.set()
+
+        assert not leader.result().cached
+        assert follower.result().cached
+        assert follower.result().text == leader.result().text
+
+    assert provider.calls == ["diff"]
+    assert not api._INFLIGHT
+
+
+def test_single_flight_propagates_errors_to_threads(providers):
+    """Test followers of a failed sync call get its error and the entry is removed."""
+    provider = providers["openai"]
+    provider.gate = threading.Event()
+    provider.error = RuntimeError("boom")
+
+    with concurrent.futures.ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(api._review_single, "diff", "gpt", "system", True, 24)
+        while not api._INFLIGHT:
+            time.sleep(0.001)
+        follower = pool.submit(api._review_single, "diff", "gpt", "system", True, 24)
+        time.sleep(0.05)
+        provider.gate.set()
+
+        with pytest.raises(RuntimeError, match="boom"):
+            leader.result()
+        with pytest.raises(RuntimeError, match="boom"):
+            follower.result()
+
+    assert not api._INFLIGHT
+
+
+def test_single_flight_coalesces_tasks(providers):
+    """Test identical concurrent async reviews on one loop share one provider call."""
+    provider = providers["openai"]
+
+    async def main():
+        provider.gate = asyncio.Event()
+        calls = [
+            asyncio.create_task(api._review_single_async("diff", "gpt", "system", True, 24))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        # Keyed by the running loop and the cache key
+        loop = asyncio.get_running_loop()
+        assert [key[0] for key in api._INFLIGHT_ASYNC] == [loop]
+        provider.gate.set()
+        return await asyncio.gather(*calls)
+
+    leader, follower = asyncio.run(main())
+    assert not leader.cached
+    assert follower.cached
+    assert follower.text == leader.text
+    assert provider.calls == ["diff"]
+    assert not api._INFLIGHT_ASYNC
+
+
+def test_single_flight_not_shared_across_loops(providers):
+    """Test calls on different event loops aren't coalesced."""
+    provider = providers["openai"]
+
+    for _ in range(2):
+        asyncio.run(api._review_single_async("diff", "gpt", "system", True, 24))
+
+    assert provider.calls == ["diff", "diff"]
+
+
+def test_single_flight_propagates_errors_to_tasks(providers):
+    """Test async followers of a failed call get its error and the entry is removed."""
+    provider = providers["openai"]
+    provider.error = RuntimeError("boom")
+
+    async def main():
+        provider.gate = asyncio.Event()
+        calls = [
+            asyncio.create_task(api._review_single_async("diff", "gpt", "system", True, 24))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        provider.gate.set()
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert [str(result) for result in results] == ["boom", "boom"]
+    assert provider.calls == ["diff"]
+    assert not api._INFLIGHT_ASYNC
+
+
+@pytest.fixture
+def multi_providers(providers, monkeypatch, tmp_path):
+    """Stub providers where earlier models answer last, plus an empty config."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    providers["openai"].delay = 0.03
+    providers["google"].delay = 0.02
+    providers["anthropic"].delay = 0.01
+    return providers
+
+
+def test_review_multi_without_running_loop(multi_providers):
+    """Test the fan-out runs on its own loop and keeps the requested model order."""
+    results = api.review("diff", models=["gpt", "gemini", "claude"])
+
+    assert list(results.results) == ["gpt", "gemini", "claude"]
+    assert results["gemini"].text == "google: diff"
+
+
+def test_review_multi_inside_running_loop(multi_providers):
+    """Test review() called from a running loop hands the fan-out to the background loop."""
+    async def main():
+        return api.review("diff", models=["gpt", "gemini", "claude"])
+
+    results = asyncio.run(main())
+
+    assert list(results.results) == ["gpt", "gemini", "claude"]
+    assert api._background_loop is not None and api._background_loop.is_running()
+
+
+def test_review_multi_failure_does_not_cancel_others(multi_providers):
+    """Test one failing model is left out without cancelling the other reviews."""
+    multi_providers["google"].error = RuntimeError("boom")
+
+    results = api.review("diff", models=["gpt", "gemini", "claude"])
+
+    assert list(results.results) == ["gpt", "claude"]
+    assert results["claude"].text == "anthropic: diff"
+
+
+def test_default_provider_shared(mock_env_vars):
+    """The API reuses one default-configured provider per name."""
+    api._get_default_provider.cache_clear()
+    try:
+        assert api._get_default_provider("openai") is api._get_default_provider("openai")
+    finally:
+        api._get_default_provider.cache_clear()
+
@@ -1,16 +1,15 @@
 """Unit tests for cache module."""
 
-import json
-
-# Import after path setup
+import os
+import sqlite3
+import subprocess
 import sys
-from datetime import datetime, timedelta
+import time
 from pathlib import Path
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
-
+from claude_mm import cache
 from claude_mm.cache import (
     cache_response,
     clear_cache,
@@ -26,9 +25,31 @@ def temp_cache_dir(monkeypatch, tmp_path):
     cache_dir = tmp_path / "cache"
     cache_dir.mkdir()
     monkeypatch.setenv("HOME", str(tmp_path))
+    cache._L1.clear()
+
+    # Tests use short prompts, so disable the minimum cacheable prompt length
+    _write_config(cache_min_chars=0)
     return cache_dir
 
 
+def _write_config(**settings):
+    """Write ~/.config/ai/config.yaml for the current (temporary) home."""
+    config_dir = Path.home() / ".config" / "ai"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    lines = "".join(f"{key}: {value}\n" for key, value in settings.items())
+    (config_dir / "config.yaml").write_text(lines)
+
+
+def _cache_db():
+    """Connection to the cache database for the current (temporary) home."""
+    return cache._connect(cache.get_cache_dir())
+
+
+def _age_entry(cache_key, hours):
+    """Move an entry's stored timestamp back by N hours."""
+    _cache_db().execute("UPDATE cache SET ts = ts - ? WHERE key = ?", (hours * 3600, cache_key))
+
+
 def test_get_cache_key():
     """Test cache key generation is deterministic."""
     key1 = get_cache_key("model1", "system", "prompt")
@@ -37,7 +58,21 @@ def test_get_cache_key():
 
     assert key1 == key2  # Same inputs = same key
     assert key1 != key3  # Different model = different key
-    assert len(key1) == 64  # SHA256 hex digest
+    assert len(key1) == 64  # 32-byte BLAKE2b hex digest
+
+
+def test_get_cache_key_normalizes_whitespace():
+    """Test trivially different prompts share a cache key."""
+    key = get_cache_key("model", "line one\n    line two", "system")
+
+    # Trailing whitespace and line endings are ignored
+    assert get_cache_key("model", "line one  \r\n    line two\n\n", "system") == key
+
+    # Indentation is significant
+    assert get_cache_key("model", "line one\nline two", "system") != key
+
+    # Normalization can be disabled
+    assert get_cache_key("model", "line one \n    line two", "system", normalize=False) != key
 
 
 def test_cache_response_and_get(temp_cache_dir):
@@ -74,23 +109,77 @@ def test_cache_expiry(temp_cache_dir, monkeypatch):
     # Verify it's there
     assert get_cached_response(model, prompt, system_prompt) == response
 
-    # Simulate time passing by modifying cache file timestamp
+    # Simulate time passing: set timestamp to 25 hours ago (past default 24hr TTL)
     cache_key = get_cache_key(model, prompt, system_prompt)
-    cache_file = Path.home() / ".config" / "claude-mm-tool" / "cache" / f"{cache_key}.json"
+    _age_entry(cache_key, 25)
 
-    # Set timestamp to 25 hours ago (past default 24hr TTL)
-    old_time = (datetime.now() - timedelta(hours=25)).isoformat()
-    with open(cache_file, "r") as f:
-        data = json.load(f)
-    data["timestamp"] = old_time
-    with open(cache_file, "w") as f:
-        json.dump(data, f)
+    # Simulate a fresh process so the edited entry is read back
+    cache._L1.clear()
 
     # Should now be expired
     cached = get_cached_response(model, prompt, system_prompt, ttl_hours=24)
     assert cached is None
 
 
+def test_expired_entries_swept_on_miss(temp_cache_dir, monkeypatch):
+    """Test expired entries are left on read and removed by the miss-path sweep."""
+    cache_response("test-model", "old prompt", "old response")
+    _age_entry(get_cache_key("test-model", "old prompt"), 25)
+    cache._L1.clear()
+
+    monkeypatch.setattr(cache, "_SWEEP_PROBABILITY", 0.0)
+    assert get_cached_response("test-model", "old prompt") is None
+    assert _cache_db().execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 1
+
+    monkeypatch.setattr(cache, "_SWEEP_PROBABILITY", 1.0)
+    assert get_cached_response("test-model", "old prompt") is None
+    assert _cache_db().execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 0
+
+
+def test_sweep_keeps_entries_within_configured_ttl(temp_cache_dir, monkeypatch):
+    """Test a short-TTL miss doesn't sweep entries still valid under the configured TTL."""
+    cache_response("test-model", "prompt", "response")
+    _age_entry(get_cache_key("test-model", "prompt"), 5)
+    cache._L1.clear()
+
+    monkeypatch.setattr(cache, "_SWEEP_PROBABILITY", 1.0)
+    assert get_cached_response("test-model", "prompt", ttl_hours=1) is None
+
+    # Still readable with the default 24h TTL
+    assert get_cached_response("test-model", "prompt") == "response"
+
+
+def test_bloom_filter_rebuilt_on_open(temp_cache_dir):
+    """Test entries stored by an earlier process pass the key filter."""
+    cache_response("test-model", "prompt", "response")
+
+    # Simulate a fresh process: reopen the database and rebuild the filter
+    for conn in cache._DB.values():
+        conn.close()
+    cache._DB.clear()
+    cache._BLOOMS.clear()
+    cache._L1.clear()
+
+    assert get_cached_response("test-model", "prompt") == "response"
+    assert get_cached_response("test-model", "missing prompt") is None
+
+
+def test_bloom_filter_sees_other_process_writes(temp_cache_dir):
+    """Test entries stored by another process after the filter was built are found."""
+    assert get_cached_response("test-model", "prompt") is None
+
+    # Another process writes through its own connection
+    other = sqlite3.connect(cache.get_cache_dir() / "cache.sqlite")
+    with other:
+        other.execute(
+            "INSERT INTO cache (key, ts, model, response) VALUES (?, ?, ?, ?)",
+            (get_cache_key("test-model", "prompt"), time.time(), "test-model", "response"),
+        )
+    other.close()
+
+    assert get_cached_response("test-model", "prompt") == "response"
+
+
 def test_clear_cache(temp_cache_dir):
     """Test clearing cache."""
     # Add some cached responses
@@ -110,6 +199,45 @@ def test_clear_cache(temp_cache_dir):
     assert get_cached_response("model2", "system", "prompt2") is None
 
 
+def test_clear_cache_older_than(temp_cache_dir):
+    """Test clearing only entries older than a cutoff."""
+    cache_response("model1", "prompt1", "response1", "system")
+    cache_response("model2", "prompt2", "response2", "system")
+
+    # Age the first entry by 25 hours
+    cache_key = get_cache_key("model1", "prompt1", "system")
+    _age_entry(cache_key, 25)
+
+    assert clear_cache(older_than_hours=24) == 1
+    assert get_cached_response("model1", "prompt1", "system") is None
+    assert get_cached_response("model2", "prompt2", "system") == "response2"
+
+
+def test_clear_cache_removes_legacy_files(temp_cache_dir):
+    """Test files left by the old JSON-file cache layout are removed."""
+    cache_dir = cache.get_cache_dir()
+    (cache_dir / "v2-abc.json").write_text("{}")
+    (cache_dir / "ab").mkdir()
+    (cache_dir / "ab" / "v2-abc.json").write_text("{}")
+
+    clear_cache()
+    assert not list(cache_dir.glob("*.json"))
+    assert not (cache_dir / "ab").exists()
+
+
+def test_prompt_length_bounds(temp_cache_dir):
+    """Test prompts outside the configured length bounds are not cached."""
+    _write_config(cache_min_chars=10, cache_max_chars=20)
+
+    cache_response("model", "short", "response1", "system")
+    cache_response("model", "x" * 21, "response2", "system")
+    cache_response("model", "just right", "response3", "system")
+
+    assert get_cache_stats()["total_files"] == 1
+    assert get_cached_response("model", "short", "system") is None
+    assert get_cached_response("model", "just right", "system") == "response3"
+
+
 def test_get_cache_stats(temp_cache_dir):
     """Test cache statistics."""
     # Empty cache
@@ -125,3 +253,50 @@ def test_get_cache_stats(temp_cache_dir):
     assert stats["total_files"] == 2
     assert stats["total_size_mb"] >= 0  # Size may be 0.0 for small test files
     assert stats["oldest"] is not None
+
+
+def test_large_response_roundtrip(temp_cache_dir):
+    """Test large (possibly compressed) responses read back unchanged."""
+    response = "def handler(request):\n    return None\n" * 500
+
+    cache_response("model", "prompt", response, "system")
+    cache._L1.clear()
+
+    assert get_cached_response("model", "prompt", "system") == response
+
+
+def test_memory_cache_hit_skips_disk(temp_cache_dir):
+    """Test repeat lookups are served from the in-process cache."""
+    cache_response("model", "prompt", "response", "system")
+
+    # Remove the stored entry; the in-process copy should still be returned
+    cache_key = get_cache_key("model", "prompt", "system")
+    _cache_db().execute("DELETE FROM cache WHERE key = ?", (cache_key,))
+
+    assert get_cached_response("model", "prompt", "system") == "response"
+
+
+def test_memory_cache_bounded(temp_cache_dir, monkeypatch):
+    """Test the in-process cache evicts least recently used entries."""
+    monkeypatch.setattr(cache, "_L1_MAX_ENTRIES", 2)
+
+    cache_response("model", "prompt1", "response1")
+    cache_response("model", "prompt2", "response2")
+    cache_response("model", "prompt3", "response3")
+
+    assert len(cache._L1) == 2
+    assert get_cache_key("model", "prompt1") not in cache._L1
+
+
+def test_semantic_cache_not_imported_when_disabled(temp_cache_dir):
+    """Test the semantic tier's module isn't loaded unless it's configured."""
+    code = (
+        "import sys\n"
+        "from claude_mm import cache\n"
+        "cache.cache_response('test-model', 'prompt', 'response')\n"
+        "assert cache.get_cached_response('test-model', 'prompt') == 'response'\n"
+        "assert cache.get_cached_response('test-model', 'other prompt') is None\n"
+        "assert 'claude_mm.semantic_cache' not in sys.modules\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(cache.__file__).parents[1])}
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
@@ -0,0 +1,121 @@
+"""Unit tests for cost_tracker module."""
+
+import os
+import time
+
+import pytest
+
+from claude_mm import cost_tracker
+from claude_mm.cost_tracker import (
+    PRICING,
+    cache_response,
+    clear_cache,
+    estimate_cost,
+    estimate_cost_from_text,
+    estimate_cost_from_text_len,
+    estimate_costs_batch,
+    get_cache_dir,
+    get_cache_stats,
+    get_cached_response,
+    get_usage_stats,
+    log_api_call,
+)
+
+
+@pytest.fixture
+def temp_home(monkeypatch, tmp_path):
+    """Use a temporary home directory for the cost log and cache."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.parametrize("model", sorted(PRICING))
+def test_estimate_cost_matches_pricing(model):
+    """Test the precomputed rate tables give the per-1M-token prices."""
+    pricing = PRICING[model]
+
+    cost = estimate_cost(model, 1_000_000, 1_000_000, 500_000)
+
+    expected = pricing["input"] / 2 + pricing["cached"] / 2 + pricing["output"]
+    assert cost == pytest.approx(expected)
+
+
+def test_estimate_cost_clamps_cached_tokens():
+    """Test cached tokens are limited to the input tokens."""
+    assert estimate_cost("gpt", 1000, 0, 5000) == pytest.approx(estimate_cost("gpt", 1000, 0, 1000))
+    assert estimate_cost("gpt", 1000, 0, -5) == pytest.approx(estimate_cost("gpt", 1000, 0))
+
+
+def test_estimate_cost_unknown_model():
+    """Test unknown models are rejected."""
+    with pytest.raises(ValueError, match="Unknown model"):
+        estimate_cost("no-such-model", 10, 10)
+
+
+def test_estimate_cost_from_text_len_matches_text():
+    """Test length-based estimates equal text-based ones."""
+    text = "x" * 4321
+
+    assert estimate_cost_from_text_len("gpt-5.2", len(text), 500, 0.5) == (
+        estimate_cost_from_text("gpt-5.2", text, 500, 0.5)
+    )
+
+
+def test_estimate_costs_batch_matches_per_text():
+    """Test batch estimates match per-text estimates."""
+    pytest.importorskip("numpy")
+
+    texts = ["", "a", "abcd" * 100, "z" * 4001]
+
+    costs, tokens = estimate_costs_batch("gpt-5.2", texts, 800, 0.25)
+
+    for i, text in enumerate(texts):
+        expected = estimate_cost_from_text("gpt-5.2", text, 800, 0.25)
+        assert tokens[i] == expected["input_tokens"]
+        assert costs[i] == pytest.approx(expected["estimated_cost"])
+
+
+def test_usage_stats(temp_home):
+    """Test logged calls are summed by model and operation."""
+    log_api_call("gpt-5.2", 100, 50, 0.25, "review")
+    log_api_call("gemini", 100, 50, 0.5, "plan")
+
+    stats = get_usage_stats()
+
+    assert stats["total_calls"] == 2
+    assert stats["total_cost"] == 0.75
+    assert stats["by_model"]["gemini"] == {"cost": 0.5, "calls": 1}
+    assert stats["by_operation"]["review"] == {"cost": 0.25, "calls": 1}
+
+
+def test_cache_roundtrip(temp_home):
+    """Test cached responses are returned until they expire."""
+    cache_response("gpt", "prompt", "response", "system")
+
+    assert get_cached_response("gpt", "prompt", "system") == "response"
+    assert get_cached_response("gpt", "prompt") is None
+    assert get_cached_response("gpt", "prompt", "system", ttl_hours=0) is None
+    # Expired entries are removed
+    assert get_cached_response("gpt", "prompt", "system") is None
+
+
+def test_clear_cache_and_stats(temp_home):
+    """Test stats and clearing use entry mtimes and skip temp files."""
+    cache_response("gpt", "old prompt", "old")
+    cache_response("gpt", "new prompt", "new")
+    cache_dir = get_cache_dir()
+    (cache_dir / ".tmp-partial.tmp").write_text("partial")
+
+    old_file = cache_dir / f"{cost_tracker.get_cache_key('gpt', 'old prompt')}.json"
+    two_hours_ago = time.time() - 7200
+    os.utime(old_file, (two_hours_ago, two_hours_ago))
+
+    stats = get_cache_stats()
+    assert stats["total_files"] == 2
+    assert stats["oldest"] < stats["newest"]
+
+    assert clear_cache(older_than_hours=1) == 1
+    assert get_cache_stats()["total_files"] == 1
+    assert clear_cache() == 1
+    assert get_cache_stats()["total_files"] == 0
+    assert (cache_dir / ".tmp-partial.tmp").exists()
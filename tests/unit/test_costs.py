@@ -1,19 +1,23 @@
 """Unit tests for costs module."""
 
-
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+import pytest
 
 from claude_mm.costs import (
     estimate_cost,
     estimate_cost_from_text,
+    estimate_costs_batch,
     estimate_tokens,
     format_cost_warning,
     should_warn_about_cost,
 )
 
+# (model, input tokens, output tokens, relative price tier)
+COST_CASES = [
+    ("gpt-5.2-instant", 1000, 500, "cheap"),
+    ("gpt-5.2", 1000, 500, "mid"),
+    ("gemini-3-flash-preview", 1000, 500, "cheapest"),
+]
+
 
 def test_estimate_tokens():
     """Test token estimation."""
@@ -29,32 +33,46 @@ def test_estimate_tokens():
     assert long_tokens > tokens
 
 
-def test_estimate_cost():
-    """Test cost estimation for different models."""
-    input_tokens = 1000
-    output_tokens = 500
+@pytest.mark.parametrize("model,input_tokens,output_tokens,tier", COST_CASES)
+def test_estimate_cost(model, input_tokens, output_tokens, tier):
+    """Test cost estimation from token counts and from text."""
+    assert estimate_cost(model, input_tokens, output_tokens) > 0
+
+    result = estimate_cost_from_text(model, "This is a test prompt for cost estimation.")
+    assert result["estimated_cost"] > 0
+    assert isinstance(result["estimated_cost"], float)
 
-    # GPT-5.2-instant (cheap)
-    cost_instant = estimate_cost("gpt-5.2-instant", input_tokens, output_tokens)
-    assert cost_instant > 0
 
-    # GPT-5.2 (more expensive)
-    cost_standard = estimate_cost("gpt-5.2", input_tokens, output_tokens)
-    assert cost_standard > cost_instant
+def test_estimate_cost_ordering():
+    """Test relative cost of the models in COST_CASES."""
+    costs = {
+        tier: estimate_cost(model, input_tokens, output_tokens)
+        for model, input_tokens, output_tokens, tier in COST_CASES
+    }
+    assert costs["cheapest"] < costs["cheap"] < costs["mid"]
 
-    # Gemini (cheapest)
-    cost_gemini = estimate_cost("gemini-3-flash-preview", input_tokens, output_tokens)
-    assert cost_gemini < cost_instant
 
+def test_estimate_costs_batch():
+    """Test batch estimates match per-call estimates."""
+    pytest.importorskip("numpy")
 
-def test_estimate_cost_from_text():
-    """Test cost estimation from text."""
-    text = "This is a test prompt for cost estimation."
-    model = "gpt-5.2-instant"
+    models = ["gpt-5.2", "gemini", "gpt-5.2", "claude"]
+    input_tokens = [1000, 2000, 0, 500]
+    output_tokens = [500, 100, 10, 0]
+    cached_tokens = [100, 0, 5, 1000]
 
-    result = estimate_cost_from_text(model, text)
-    assert result["estimated_cost"] > 0
-    assert isinstance(result["estimated_cost"], float)
+    costs = estimate_costs_batch(models, input_tokens, output_tokens, cached_tokens)
+    for i, model in enumerate(models):
+        expected = estimate_cost(model, input_tokens[i], output_tokens[i], cached_tokens[i])
+        assert costs[i] == pytest.approx(expected)
+
+
+def test_estimate_costs_batch_empty():
+    """Test an empty batch gives an empty result."""
+    pytest.importorskip("numpy")
+
+    assert estimate_costs_batch([], [], []).shape == (0,)
+    assert estimate_costs_batch([], [], [], []).shape == (0,)
 
 
 def test_format_cost_warning():
@@ -62,17 +80,19 @@ def test_format_cost_warning():
     warning = format_cost_warning("gpt-5.2-instant", 0.05, "test operation")
     assert "$0.05" in warning
     assert "test operation" in warning
+    assert "EXPENSIVE" not in warning
 
+    assert "EXPENSIVE" in format_cost_warning("gpt-5.2-pro", 0.05)
 
-def test_should_warn_about_cost():
-    """Test cost warning threshold."""
-    model = "gpt-5.2-instant"
-
-    # Small cost - no warning
-    assert not should_warn_about_cost(model, 0.01, threshold=0.10)
-
-    # Large cost - warning
-    assert should_warn_about_cost(model, 0.15, threshold=0.10)
 
-    # Exactly at threshold - no warning (must exceed threshold)
-    assert not should_warn_about_cost(model, 0.10, threshold=0.10)
+@pytest.mark.parametrize(
+    "cost,expected",
+    [
+        (0.01, False),  # Small cost - no warning
+        (0.15, True),  # Large cost - warning
+        (0.10, False),  # Exactly at threshold - no warning (must exceed threshold)
+    ],
+)
+def test_should_warn_about_cost(cost, expected):
+    """Test cost warning threshold."""
+    assert should_warn_about_cost("gpt-5.2-instant", cost, threshold=0.10) is expected
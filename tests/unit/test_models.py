@@ -1,11 +1,8 @@
 """Unit tests for models module."""
 
-import sys
-from pathlib import Path
-
 import pytest
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+from hypothesis import given
+from hypothesis import strategies as st
 
 from claude_mm.models import (
     CLAUDE_ALIASES,
@@ -18,10 +15,31 @@ from claude_mm.models import (
     get_model_display_name,
     get_provider_for_model,
     list_all_aliases,
-    list_all_models,
     normalize_model_name,
 )
 
+# Expected display names and characteristics by API model name
+EXPECTED_DISPLAY = {
+    "gpt-5.2-chat-latest": "GPT-5.2 Instant",
+    "gpt-5.2": "GPT-5.2 Thinking",
+    "gpt-5.2-pro": "GPT-5.2 Pro",
+    "gemini-3-flash-preview": "Gemini 3 Flash",
+    "claude-sonnet-4-5-20250929": "Claude Sonnet 4.5",
+}
+
+EXPECTED_CHARS = {
+    "gpt-5.2-chat-latest": {"speed": "fast", "cost_tier": "low", "context_window": 128000},
+    "gpt-5.2": {"speed": "medium", "cost_tier": "medium", "context_window": 128000},
+    "gpt-5.2-pro": {"speed": "slow", "cost_tier": "high", "context_window": 128000},
+    "gemini-3-flash-preview": {"speed": "fast", "cost_tier": "low", "context_window": 1000000},
+    "claude-sonnet-4-5-20250929": {
+        "speed": "fast", "cost_tier": "medium", "context_window": 200000,
+    },
+}
+
+# Every registered alias, collected once at import for parametrized tests
+_ALL_ALIASES = list(list_all_aliases())
+
 
 class TestModelRegistries:
     """Test model registries are properly defined."""
@@ -63,120 +81,73 @@ class TestModelRegistries:
 class TestGetProviderForModel:
     """Test provider detection from model names."""
 
-    def test_openai_models(self):
-        """OpenAI models resolve to 'openai' provider."""
-        assert get_provider_for_model("gpt-5.2") == "openai"
-        assert get_provider_for_model("gpt-5.2-chat-latest") == "openai"
-        assert get_provider_for_model("gpt-5.2-pro") == "openai"
-
-    def test_openai_aliases(self):
-        """OpenAI aliases resolve to 'openai' provider."""
-        assert get_provider_for_model("gpt") == "openai"
-        assert get_provider_for_model("gpt-5.2-instant") == "openai"
-
-    def test_gemini_models(self):
-        """Gemini models resolve to 'google' provider."""
-        assert get_provider_for_model("gemini-3-flash-preview") == "google"
-
-    def test_gemini_aliases(self):
-        """Gemini aliases resolve to 'google' provider."""
-        assert get_provider_for_model("gemini") == "google"
-
-    def test_claude_models(self):
-        """Claude models resolve to 'anthropic' provider."""
-        assert get_provider_for_model("claude-sonnet-4-5-20250929") == "anthropic"
-
-    def test_claude_aliases(self):
-        """Claude aliases resolve to 'anthropic' provider."""
-        assert get_provider_for_model("claude") == "anthropic"
-
-    def test_unknown_model(self):
-        """Unknown models return None."""
-        assert get_provider_for_model("unknown-model") is None
-        assert get_provider_for_model("gpt-99") is None
+    @pytest.mark.parametrize(
+        "name,expected_provider",
+        [
+            # OpenAI models and aliases
+            ("gpt-5.2", "openai"),
+            ("gpt-5.2-chat-latest", "openai"),
+            ("gpt-5.2-pro", "openai"),
+            ("gpt", "openai"),
+            ("gpt-5.2-instant", "openai"),
+            # Gemini models and aliases
+            ("gemini-3-flash-preview", "google"),
+            ("gemini", "google"),
+            # Claude models and aliases
+            ("claude-sonnet-4-5-20250929", "anthropic"),
+            ("claude", "anthropic"),
+            # Unknown models return None
+            ("unknown-model", None),
+            ("gpt-99", None),
+        ],
+        ids=lambda value: value if isinstance(value, str) else "none",
+    )
+    def test_provider_lookup(self, name, expected_provider):
+        """Model names and aliases resolve to their provider."""
+        assert get_provider_for_model(name) == expected_provider
 
 
 class TestNormalizeModelName:
     """Test model name normalization."""
 
-    def test_openai_direct_models(self):
-        """OpenAI direct model names normalize correctly."""
-        provider, model = normalize_model_name("gpt-5.2")
-        assert provider == "openai"
-        assert model == "gpt-5.2"
-
-        provider, model = normalize_model_name("gpt-5.2-chat-latest")
-        assert provider == "openai"
-        assert model == "gpt-5.2-chat-latest"
-
-        provider, model = normalize_model_name("gpt-5.2-pro")
-        assert provider == "openai"
-        assert model == "gpt-5.2-pro"
-
-    def test_openai_aliases(self):
-        """OpenAI aliases resolve to API names."""
-        provider, model = normalize_model_name("gpt")
-        assert provider == "openai"
-        assert model == "gpt-5.2"  # Default GPT model
-
-        # CRITICAL: Backward compatibility for old name
-        provider, model = normalize_model_name("gpt-5.2-instant")
-        assert provider == "openai"
-        assert model == "gpt-5.2-chat-latest"
-
-        provider, model = normalize_model_name("gpt-instant")
-        assert provider == "openai"
-        assert model == "gpt-5.2-chat-latest"
-
-    def test_gemini_direct_models(self):
-        """Gemini direct model names normalize correctly."""
-        provider, model = normalize_model_name("gemini-3-flash-preview")
-        assert provider == "google"
-        assert model == "gemini-3-flash-preview"
-
-    def test_gemini_aliases(self):
-        """Gemini aliases resolve to API names."""
-        provider, model = normalize_model_name("gemini")
-        assert provider == "google"
-        assert model == "gemini-3-flash-preview"
-
-    def test_claude_direct_models(self):
-        """Claude direct model names normalize correctly."""
-        provider, model = normalize_model_name("claude-sonnet-4-5-20250929")
-        assert provider == "anthropic"
-        assert model == "claude-sonnet-4-5-20250929"
-
-    def test_claude_aliases(self):
-        """Claude aliases resolve to API names."""
-        provider, model = normalize_model_name("claude")
-        assert provider == "anthropic"
-        assert model == "claude-sonnet-4-5-20250929"
-
-    def test_unknown_model_raises(self):
+    @pytest.mark.parametrize(
+        "name,expected_provider,expected_model",
+        [
+            # OpenAI direct models
+            ("gpt-5.2", "openai", "gpt-5.2"),
+            ("gpt-5.2-chat-latest", "openai", "gpt-5.2-chat-latest"),
+            ("gpt-5.2-pro", "openai", "gpt-5.2-pro"),
+            # OpenAI aliases ("gpt" is the default GPT model; "gpt-5.2-instant" is
+            # CRITICAL for backward compatibility)
+            ("gpt", "openai", "gpt-5.2"),
+            ("gpt-5.2-instant", "openai", "gpt-5.2-chat-latest"),
+            ("gpt-instant", "openai", "gpt-5.2-chat-latest"),
+            # Gemini
+            ("gemini-3-flash-preview", "google", "gemini-3-flash-preview"),
+            ("gemini", "google", "gemini-3-flash-preview"),
+            # Claude
+            ("claude-sonnet-4-5-20250929", "anthropic", "claude-sonnet-4-5-20250929"),
+            ("claude", "anthropic", "claude-sonnet-4-5-20250929"),
+        ],
+    )
+    def test_normalize(self, name, expected_provider, expected_model):
+        """Model names and aliases normalize to (provider, API model name)."""
+        assert normalize_model_name(name) == (expected_provider, expected_model)
+
+    @pytest.mark.parametrize("name", ["unknown-model", "gpt-99"])
+    def test_normalize_raises(self, name):
         """Unknown models raise ValueError."""
         with pytest.raises(ValueError, match="Unknown model"):
-            normalize_model_name("unknown-model")
-
-        with pytest.raises(ValueError, match="Unknown model"):
-            normalize_model_name("gpt-99")
+            normalize_model_name(name)
 
 
 class TestGetModelDisplayName:
     """Test human-readable display names."""
 
-    def test_openai_display_names(self):
-        """OpenAI models have proper display names."""
-        assert get_model_display_name("gpt-5.2-chat-latest") == "GPT-5.2 Instant"
-        assert get_model_display_name("gpt-5.2") == "GPT-5.2 Thinking"
-        assert get_model_display_name("gpt-5.2-pro") == "GPT-5.2 Pro"
-
-    def test_gemini_display_names(self):
-        """Gemini models have proper display names."""
-        assert get_model_display_name("gemini-3-flash-preview") == "Gemini 3 Flash"
-
-    def test_claude_display_names(self):
-        """Claude models have proper display names."""
-        assert get_model_display_name("claude-sonnet-4-5-20250929") == "Claude Sonnet 4.5"
+    @pytest.mark.parametrize("model,expected", EXPECTED_DISPLAY.items())
+    def test_display_names(self, model, expected):
+        """Models have proper display names."""
+        assert get_model_display_name(model) == expected
 
     def test_unknown_model_returns_original(self):
         """Unknown models return the original name."""
@@ -186,42 +157,14 @@ class TestGetModelDisplayName:
 class TestGetModelCharacteristics:
     """Test model characteristics metadata."""
 
-    def test_openai_instant_characteristics(self):
-        """GPT-5.2 Instant has correct characteristics."""
-        chars = get_model_characteristics("gpt-5.2-chat-latest")
-        assert chars["speed"] == "fast"
-        assert chars["cost_tier"] == "low"
-        assert chars["context_window"] == 128000
+    @pytest.mark.parametrize("model,expected", EXPECTED_CHARS.items())
+    def test_characteristics(self, model, expected):
+        """Models have correct characteristics."""
+        chars = get_model_characteristics(model)
+        for key, value in expected.items():
+            assert chars[key] == value
         assert "description" in chars
 
-    def test_openai_thinking_characteristics(self):
-        """GPT-5.2 Thinking has correct characteristics."""
-        chars = get_model_characteristics("gpt-5.2")
-        assert chars["speed"] == "medium"
-        assert chars["cost_tier"] == "medium"
-        assert chars["context_window"] == 128000
-
-    def test_openai_pro_characteristics(self):
-        """GPT-5.2 Pro has correct characteristics."""
-        chars = get_model_characteristics("gpt-5.2-pro")
-        assert chars["speed"] == "slow"
-        assert chars["cost_tier"] == "high"
-        assert chars["context_window"] == 128000
-
-    def test_gemini_characteristics(self):
-        """Gemini has correct characteristics."""
-        chars = get_model_characteristics("gemini-3-flash-preview")
-        assert chars["speed"] == "fast"
-        assert chars["cost_tier"] == "low"
-        assert chars["context_window"] == 1000000
-
-    def test_claude_characteristics(self):
-        """Claude has correct characteristics."""
-        chars = get_model_characteristics("claude-sonnet-4-5-20250929")
-        assert chars["speed"] == "fast"
-        assert chars["cost_tier"] == "medium"
-        assert chars["context_window"] == 200000
-
     def test_unknown_model_has_defaults(self):
         """Unknown models get default characteristics."""
         chars = get_model_characteristics("unknown-model")
@@ -234,23 +177,21 @@ class TestGetModelCharacteristics:
 class TestListFunctions:
     """Test listing functions."""
 
-    def test_list_all_models(self):
+    def test_list_all_models(self, all_models):
         """list_all_models returns all models by provider."""
-        models = list_all_models()
-        assert "openai" in models
-        assert "google" in models
-        assert "anthropic" in models
-        assert isinstance(models["openai"], list)
-        assert len(models["openai"]) > 0
-
-    def test_list_all_aliases(self):
+        assert "openai" in all_models
+        assert "google" in all_models
+        assert "anthropic" in all_models
+        assert isinstance(all_models["openai"], list)
+        assert len(all_models["openai"]) > 0
+
+    def test_list_all_aliases(self, all_aliases):
         """list_all_aliases returns all aliases."""
-        aliases = list_all_aliases()
-        assert "gpt" in aliases
-        assert "gpt-5.2-instant" in aliases  # Backward compatibility
-        assert "gemini" in aliases
-        assert "claude" in aliases
-        assert isinstance(aliases, dict)
+        assert "gpt" in all_aliases
+        assert "gpt-5.2-instant" in all_aliases  # Backward compatibility
+        assert "gemini" in all_aliases
+        assert "claude" in all_aliases
+        assert isinstance(all_aliases, dict)
 
 
 class TestBackwardCompatibility:
@@ -266,11 +207,17 @@ class TestBackwardCompatibility:
         # Verify it's recognized as OpenAI
         assert get_provider_for_model("gpt-5.2-instant") == "openai"
 
-    def test_all_aliases_resolve(self):
+    @pytest.mark.parametrize("alias", _ALL_ALIASES)
+    def test_all_aliases_resolve(self, alias):
         """All defined aliases successfully resolve."""
-        all_aliases = list_all_aliases()
-        for alias, _ in all_aliases.items():
-            # Should not raise ValueError
-            provider, model = normalize_model_name(alias)
-            assert provider is not None
-            assert model is not None
+        # Should not raise ValueError
+        provider, model = normalize_model_name(alias)
+        assert provider is not None
+        assert model is not None
+
+    @given(alias=st.sampled_from(_ALL_ALIASES))
+    def test_alias_resolution_consistent(self, alias):
+        """Resolved model names resolve to themselves, with the alias's provider."""
+        provider, model = normalize_model_name(alias)
+        assert normalize_model_name(model) == (provider, model)
+        assert get_provider_for_model(alias) == provider
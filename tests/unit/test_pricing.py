@@ -0,0 +1,119 @@
+"""Unit tests for pricing module."""
+
+import gzip
+import io
+import json
+import logging
+import os
+
+import pytest
+import yaml
+
+from claude_mm import pricing
+from claude_mm.pricing import (
+    DEFAULT_PRICING,
+    get_pricing_file,
+    load_pricing,
+)
+
+
+@pytest.fixture
+def temp_home(monkeypatch, tmp_path):
+    """Use a temporary home directory for the pricing file."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+
+def _custom_pricing(input_price):
+    """Pricing data with a custom Sonnet input price."""
+    data = {provider: dict(models) for provider, models in DEFAULT_PRICING.items()}
+    data["anthropic"]["claude-sonnet-4-5-20250929"] = {"input": input_price, "output": 15.0}
+    return data
+
+
+def test_defaults_saved_when_missing(temp_home):
+    """Without a pricing file, the embedded defaults are used and saved."""
+    assert load_pricing() is DEFAULT_PRICING
+    assert get_pricing_file().exists()
+
+
+def test_yaml_pricing_migrated(temp_home):
+    """An old pricing.yaml is loaded and rewritten as pricing.json."""
+    legacy_file = get_pricing_file().with_suffix(".yaml")
+    legacy_file.write_text(yaml.safe_dump(_custom_pricing(4.0)))
+
+    migrated = load_pricing()
+
+    assert migrated["anthropic"]["claude-sonnet-4-5-20250929"]["input"] == 4.0
+    assert get_pricing_file().exists()
+    assert load_pricing() == migrated
+
+
+def test_unchanged_file_not_reparsed(temp_home, monkeypatch):
+    """Loads return the cached pricing while the file's mtime is unchanged."""
+    load_pricing()
+    first = load_pricing()
+
+    monkeypatch.setattr(pricing, "orjson", None)
+    monkeypatch.setattr(pricing.json, "load", lambda f: pytest.fail("pricing re-parsed"))
+
+    assert load_pricing() is first
+
+
+def test_rewritten_file_reloaded(temp_home):
+    """Rewriting the pricing file (new mtime) reloads it."""
+    load_pricing()
+    first = load_pricing()
+    pricing_file = get_pricing_file()
+    mtime_ns = pricing_file.stat().st_mtime_ns
+
+    pricing.save_pricing(_custom_pricing(5.0))
+    os.utime(pricing_file, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+    reloaded = load_pricing()
+    assert reloaded is not first
+    assert reloaded["anthropic"]["claude-sonnet-4-5-20250929"]["input"] == 5.0
+
+
+class FakeResponse(io.BytesIO):
+    """Fake urlopen response."""
+
+    def __init__(self, body, headers):
+        super().__init__(body)
+        self.headers = headers
+
+
+@pytest.mark.parametrize("compressed", [True, False], ids=["gzip", "identity"])
+def test_update_pricing_from_url(temp_home, monkeypatch, caplog, compressed):
+    """Downloaded pricing (gzip-encoded or not) is validated and saved."""
+    body = json.dumps(_custom_pricing(6.0)).encode()
+    headers = {"Content-Encoding": "gzip"} if compressed else {}
+    if compressed:
+        body = gzip.compress(body)
+    requests = []
+
+    def urlopen(request, timeout):
+        requests.append(request)
+        return FakeResponse(body, headers)
+
+    monkeypatch.setattr(pricing.urllib.request, "urlopen", urlopen)
+
+    with caplog.at_level(logging.INFO, logger="claude_mm.pricing"):
+        assert pricing.update_pricing_from_url("https://example.com/pricing.json")
+
+    assert requests[0].get_header("Accept-encoding") == "gzip"
+    assert "Updated pricing from https://example.com/pricing.json" in caplog.text
+    saved = load_pricing()
+    assert saved["anthropic"]["claude-sonnet-4-5-20250929"]["input"] == 6.0
+    assert saved["_metadata"]["source"] == "https://example.com/pricing.json"
+
+
+def test_update_pricing_rejects_incomplete_data(temp_home, monkeypatch):
+    """Pricing missing a provider isn't saved."""
+    body = json.dumps({"openai": {}}).encode()
+    monkeypatch.setattr(
+        pricing.urllib.request, "urlopen", lambda request, timeout: FakeResponse(body, {})
+    )
+
+    assert not pricing.update_pricing_from_url("https://example.com/pricing.json")
+    assert load_pricing() is DEFAULT_PRICING
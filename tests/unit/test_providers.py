@@ -0,0 +1,516 @@
+"""Unit tests for providers package."""
+
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+
+from claude_mm import api, cache
+from claude_mm.providers import AnthropicProvider, OpenAIProvider, _http, base, get_provider
+from claude_mm.providers.base import (
+    Provider,
+    ProviderResponse,
+    cached_completion,
+    rate_limited,
+    single_flight,
+)
+
+SONNET = "claude-sonnet-4-5-20250929"
+
+
+@pytest.fixture
+def temp_home(monkeypatch, tmp_path):
+    """Use a temporary home (cache, config and pricing) during tests."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    cache._L1.clear()
+
+    # Tests use short prompts, so disable the minimum cacheable prompt length
+    config_dir = Path.home() / ".config" / "ai"
+    config_dir.mkdir(parents=True)
+    (config_dir / "config.yaml").write_text("cache_min_chars: 0\n")
+    return tmp_path
+
+
+class FakeProvider(Provider):
+    """Provider returning canned responses and counting calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def _respond(self, prompt, model):
+        self.calls += 1
+        return ProviderResponse(
+            text=f"response {self.calls}", model=model,
+            input_tokens=10, output_tokens=5, cost_picodollars=1000,
+        )
+
+    @cached_completion
+    def complete(
+        self,
+        prompt: str,
+        model: str = "fake-model",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> ProviderResponse:
+        return self._respond(prompt, model)
+
+    @cached_completion
+    async def complete_async(
+        self,
+        prompt: str,
+        model: str = "fake-model",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> ProviderResponse:
+        return self._respond(prompt, model)
+
+    def get_model_info(self, model: str) -> dict:
+        return {"provider": "fake", "model": model, "pricing": {"input": 1.0, "output": 2.0}}
+
+
+class TestCachedCompletion:
+    """Test response caching of deterministic completions."""
+
+    def test_deterministic_call_cached(self, temp_home):
+        """Temperature 0 requests are served from the cache on repeat."""
+        provider = FakeProvider()
+
+        first = provider.complete("prompt", temperature=0)
+        second = provider.complete("prompt", temperature=0)
+
+        assert not first.cached
+        assert second.cached
+        assert second.text == first.text
+        assert second.cost == 0
+        assert provider.calls == 1
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"temperature": 0.7},
+            {"temperature": 0, "max_tokens": 100},
+            {"temperature": 0, "top_p": 0.5},
+            {"temperature": 0, "use_cache": False},
+        ],
+        ids=["sampled", "max_tokens", "extra_params", "opt_out"],
+    )
+    def test_non_deterministic_call_not_cached(self, temp_home, kwargs):
+        """Sampled, truncated or customized requests always reach the provider."""
+        provider = FakeProvider()
+
+        provider.complete("prompt", **kwargs)
+        response = provider.complete("prompt", **kwargs)
+
+        assert not response.cached
+        assert provider.calls == 2
+
+    def test_async_call_cached(self, temp_home):
+        """The async wrapper caches like the sync one."""
+        provider = FakeProvider()
+
+        async def main():
+            await provider.complete_async("prompt", temperature=0)
+            return await provider.complete_async("prompt", temperature=0)
+
+        assert asyncio.run(main()).cached
+        assert provider.calls == 1
+
+    def test_dropped_temperature_not_cached(self, temp_home, monkeypatch):
+        """GPT-5 requests are sent without temperature, so they're never cached."""
+        provider = OpenAIProvider(api_key="test-key")
+        calls = []
+
+        def create(**params):
+            calls.append(params)
+            return SimpleNamespace(
+                usage=None,
+                choices=[SimpleNamespace(message=SimpleNamespace(content="text"))],
+            )
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        monkeypatch.setattr(provider, "_get_client", lambda: client)
+
+        provider.complete("prompt", model="gpt-5.2", temperature=0)
+        assert not provider.complete("prompt", model="gpt-5.2", temperature=0).cached
+        assert len(calls) == 2
+        assert "temperature" not in calls[0]
+
+        # Older models honor temperature 0 and are cached
+        provider.complete("prompt", model="gpt-4o", temperature=0)
+        assert provider.complete("prompt", model="gpt-4o", temperature=0).cached
+        assert len(calls) == 3
+
+
+class SlowProvider(FakeProvider):
+    """Provider whose async completion waits on a gate and tracks concurrency."""
+
+    def __init__(self, rpm=None):
+        super().__init__()
+        self.rpm = rpm
+        self.active = 0
+        self.peak = 0
+        self.gate = None
+
+    @single_flight
+    @rate_limited
+    async def complete_async(
+        self,
+        prompt: str,
+        model: str = "fake-model",
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> ProviderResponse:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if self.gate is not None:
+                await self.gate.wait()
+            else:
+                await asyncio.sleep(0.01)
+            return self._respond(prompt, model)
+        finally:
+            self.active -= 1
+
+    def get_model_info(self, model: str) -> dict:
+        return {"provider": "fake", "model": model, "rpm": self.rpm}
+
+
+class TestSingleFlight:
+    """Test coalescing of identical concurrent async calls."""
+
+    def test_identical_calls_coalesced(self):
+        """Followers share the first call's response, marked cached and free."""
+        provider = SlowProvider()
+
+        async def main():
+            provider.gate = asyncio.Event()
+            calls = [asyncio.create_task(provider.complete_async("prompt")) for _ in range(3)]
+            await asyncio.sleep(0)
+            provider.gate.set()
+            return await asyncio.gather(*calls)
+
+        leader, *followers = asyncio.run(main())
+        assert provider.calls == 1
+        assert not leader.cached
+        assert leader.cost_picodollars == 1000
+        for follower in followers:
+            assert follower.cached
+            assert follower.text == leader.text
+            assert follower.cost == 0
+            assert follower.cost_picodollars == 0
+        assert not base._INFLIGHT
+
+    def test_different_calls_not_coalesced(self):
+        """Calls with different arguments each reach the provider."""
+        provider = SlowProvider()
+
+        async def main():
+            return await asyncio.gather(
+                provider.complete_async("prompt"),
+                provider.complete_async("prompt", temperature=0.2),
+                provider.complete_async("other prompt"),
+            )
+
+        asyncio.run(main())
+        assert provider.calls == 3
+
+    def test_unhashable_arguments_not_coalesced(self):
+        """Calls with unhashable arguments bypass coalescing instead of failing."""
+        provider = SlowProvider()
+
+        async def main():
+            return await asyncio.gather(
+                provider.complete_async("prompt", metadata={"a": 1}),
+                provider.complete_async("prompt", metadata={"a": 1}),
+            )
+
+        asyncio.run(main())
+        assert provider.calls == 2
+
+
+class TestRateLimited:
+    """Test per-model concurrency limits of async calls."""
+
+    @pytest.mark.parametrize(
+        "rpm,expected_peak",
+        [(6, 3), (1, 1), (None, base.DEFAULT_RPM // 2)],
+        ids=["half_rpm", "at_least_one", "default_rpm"],
+    )
+    def test_concurrency_capped(self, rpm, expected_peak):
+        """At most max(1, rpm // 2) calls per model run at once."""
+        provider = SlowProvider(rpm)
+
+        async def main():
+            await asyncio.gather(
+                *(provider.complete_async(f"prompt {i}") for i in range(base.DEFAULT_RPM))
+            )
+
+        asyncio.run(main())
+        assert provider.calls == base.DEFAULT_RPM
+        assert provider.peak == expected_peak
+
+    def test_models_limited_separately(self):
+        """Each model has its own semaphore."""
+        provider = SlowProvider(rpm=2)
+
+        async def main():
+            await asyncio.gather(
+                *(provider.complete_async("prompt", model=f"model-{i}") for i in range(3))
+            )
+
+        asyncio.run(main())
+        assert provider.peak == 3
+
+
+def _message(text, input_tokens=1000, output_tokens=500, cache_write=0, cache_read=0):
+    """Fake Anthropic Message."""
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_creation_input_tokens=cache_write,
+            cache_read_input_tokens=cache_read,
+        ),
+    )
+
+
+class FakeBatches:
+    """Fake client.messages.batches finishing after a number of status checks."""
+
+    def __init__(self, results, polls):
+        self.results_list = results
+        self.statuses = ["in_progress"] * polls + ["ended"]
+        self.requests = None
+
+    def create(self, requests):
+        self.requests = requests
+        return SimpleNamespace(id="batch-1", processing_status=self.statuses.pop(0))
+
+    def retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, processing_status=self.statuses.pop(0))
+
+    def results(self, batch_id):
+        return iter(self.results_list)
+
+
+class TestAnthropicBatch:
+    """Test Message Batches submission in AnthropicProvider.complete_batch."""
+
+    def _run(self, monkeypatch, results, polls=0, **kwargs):
+        sleeps = []
+        monkeypatch.setattr("claude_mm.providers.anthropic.time.sleep", sleeps.append)
+        batches = FakeBatches(results, polls)
+        provider = AnthropicProvider(api_key="test-key")
+        client = SimpleNamespace(messages=SimpleNamespace(batches=batches))
+        monkeypatch.setattr(provider, "_get_client", lambda: client)
+        prompts = [f"prompt {i}" for i in range(len(results))]
+        responses = provider.complete_batch(prompts, model=SONNET, **kwargs)
+        return responses, batches, sleeps
+
+    def test_polling_backoff(self, temp_home, monkeypatch):
+        """Status checks back off exponentially up to max_poll_interval."""
+        results = [SimpleNamespace(
+            custom_id="req-0", result=SimpleNamespace(type="succeeded", message=_message("a"))
+        )]
+
+        _, _, sleeps = self._run(monkeypatch, results, polls=6, max_poll_interval=10)
+
+        assert sleeps == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+
+    def test_results_reordered_and_discounted(self, temp_home, monkeypatch):
+        """Results come back in prompt order, billed at the batch discount."""
+        results = [
+            SimpleNamespace(
+                custom_id=f"req-{i}",
+                result=SimpleNamespace(type="succeeded", message=_message(f"answer {i}")),
+            )
+            for i in (2, 0, 1)
+        ]
+
+        responses, batches, _ = self._run(monkeypatch, results)
+
+        assert [r.text for r in responses] == ["answer 0", "answer 1", "answer 2"]
+        assert [r["custom_id"] for r in batches.requests] == ["req-0", "req-1", "req-2"]
+        assert batches.requests[1]["params"]["messages"][0]["content"] == "prompt 1"
+        # Sonnet 4.5: $3 / $15 per 1M tokens, halved for batches
+        for response in responses:
+            assert response.cost_picodollars == 5_250_000_000
+            assert response.cost == Decimal("0.00525")
+
+    def test_errored_and_expired_entries(self, temp_home, monkeypatch):
+        """Failed requests get empty, free responses with the reason in metadata."""
+        results = [
+            SimpleNamespace(
+                custom_id="req-1",
+                result=SimpleNamespace(type="errored", error="overloaded_error"),
+            ),
+            SimpleNamespace(custom_id="req-0", result=SimpleNamespace(type="expired")),
+        ]
+
+        responses, _, _ = self._run(monkeypatch, results)
+
+        assert [r.metadata["error"] for r in responses] == ["expired", "overloaded_error"]
+        for response in responses:
+            assert response.text == ""
+            assert response.cost == 0
+
+
+class PricedProvider(FakeProvider):
+    """Provider with per-model pricing, in USD per 1M tokens."""
+
+    PRICING = {
+        "fake-model": {"input": 1.0, "output": 2.0},
+        # Not exactly representable as binary floats
+        "fake-mini": {"input": 0.075, "output": 0.3},
+    }
+
+    def get_model_info(self, model: str) -> dict:
+        return {"provider": "fake", "model": model, "pricing": self.PRICING.get(model)}
+
+
+class TestPicodollarCosts:
+    """Test exact integer picodollar cost accounting."""
+
+    @pytest.mark.parametrize(
+        "model,input_tokens,output_tokens,picodollars,usd",
+        [
+            ("fake-model", 1000, 500, 2_000_000_000, "0.002"),
+            ("fake-mini", 1, 1, 375_000, "0.000000375"),
+            ("fake-mini", 1_000_000, 1_000_000, 375_000_000_000, "0.375"),
+            ("fake-mini", 0, 0, 0, "0"),
+            ("unpriced-model", 1000, 1000, 0, "0"),
+        ],
+    )
+    def test_estimate_cost(self, temp_home, model, input_tokens, output_tokens, picodollars, usd):
+        """Costs are exact, with no float rounding of fractional prices."""
+        provider = PricedProvider()
+
+        assert provider.estimate_cost_picodollars(input_tokens, output_tokens, model) == picodollars
+        assert provider.estimate_cost(input_tokens, output_tokens, model) == Decimal(usd)
+
+    def test_response_cost_derived_from_picodollars(self):
+        """ProviderResponse.cost is the exact USD value of cost_picodollars."""
+        response = ProviderResponse(
+            text="", model="m", input_tokens=0, output_tokens=0, cost_picodollars=1
+        )
+
+        assert response.cost == Decimal("1E-12")
+
+    @pytest.mark.parametrize(
+        "cache_write,cache_read,picodollars",
+        [
+            (1000, 0, 3_750_000_000),  # 1.25x the $3/MTok input rate
+            (0, 1000, 300_000_000),  # 0.1x the input rate
+            (1000, 1000, 4_050_000_000),
+            (0, 0, 0),
+        ],
+        ids=["write", "read", "both", "none"],
+    )
+    def test_prompt_cache_cost(self, temp_home, cache_write, cache_read, picodollars):
+        """Prompt-cache writes and reads are billed relative to the input rate."""
+        provider = AnthropicProvider(api_key="test-key")
+        metadata = {
+            "cache_creation_input_tokens": cache_write,
+            "cache_read_input_tokens": cache_read,
+        }
+
+        assert provider._prompt_cache_cost(metadata, SONNET) == picodollars
+
+    def test_anthropic_response_cost(self, temp_home):
+        """Message cost adds prompt-cache tokens to regular input and output tokens."""
+        provider = AnthropicProvider(api_key="test-key")
+        message = _message("text", input_tokens=1000, output_tokens=500,
+                           cache_write=1000, cache_read=1000)
+
+        response = provider._to_response(message, SONNET)
+
+        # 3e9 input + 7.5e9 output + 3.75e9 cache write + 0.3e9 cache read
+        assert response.cost_picodollars == 14_550_000_000
+        assert response.cost == Decimal("0.01455")
+
+
+class TestModelInfo:
+    """Test memoized model information."""
+
+    def test_info_is_read_only(self, temp_home):
+        """Memoized info can't be changed through the returned mapping."""
+        provider = AnthropicProvider(api_key="test-key")
+
+        info = provider.get_model_info(SONNET)
+        with pytest.raises(TypeError):
+            info["context_window"] = 1
+        with pytest.raises(TypeError):
+            info["pricing"]["input"] = 1000.0
+
+        assert provider.get_model_info(SONNET)["context_window"] == 200000
+        assert provider.get_model_info(SONNET)["pricing"]["input"] == 3.0
+        assert provider.estimate_cost_picodollars(1, 0, SONNET) == 3_000_000
+
+
+class FakeAsyncClient:
+    """Stand-in for httpx.AsyncClient recording when it's closed."""
+
+    def __init__(self, **kwargs):
+        self.is_closed = False
+
+    async def aclose(self):
+        self.is_closed = True
+
+
+@pytest.fixture
+def fake_httpx(monkeypatch):
+    """Make the shared HTTP pool use FakeAsyncClient."""
+    monkeypatch.setattr(_http, "httpx", SimpleNamespace(
+        AsyncClient=FakeAsyncClient,
+        Limits=lambda **kwargs: None,
+        Timeout=lambda *args, **kwargs: None,
+    ))
+
+
+class TestAsyncHttp:
+    """Test the per-event-loop shared HTTP client."""
+
+    def test_client_shared_per_loop(self, fake_httpx):
+        """Calls on one loop share a client; another loop gets its own."""
+        async def main():
+            client = _http.get_async_http()
+            assert _http.get_async_http() is client
+            return client
+
+        assert asyncio.run(main()) is not asyncio.run(main())
+
+    def test_client_closed_by_sync_api(self, fake_httpx):
+        """The sync API's fan-out closes the loop's client before the loop exits."""
+        async def main():
+            return _http.get_async_http()
+
+        assert asyncio.run(api._closing_http(main())).is_closed
+
+    def test_client_closed_explicitly(self, fake_httpx):
+        """aclose_async_http closes the client and a later call creates a new one."""
+        async def main():
+            client = _http.get_async_http()
+            await _http.aclose_async_http()
+            assert client.is_closed
+            assert _http.get_async_http() is not client
+
+        asyncio.run(main())
+
+
+def test_get_provider_builds_new_instances(mock_env_vars):
+    """get_provider accepts any configuration and isn't memoized."""
+    provider = get_provider("openai", headers={"X-Test": "1"})
+
+    assert provider.config == {"headers": {"X-Test": "1"}}
+    assert get_provider("openai") is not get_provider("openai")
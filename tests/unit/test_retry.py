@@ -1,13 +1,9 @@
 """Unit tests for retry module."""
 
-import sys
-from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
-
 from claude_mm.retry import retry_with_backoff
 
 
@@ -57,3 +53,86 @@ def test_retry_with_backoff_no_retry_on_auth_error():
         decorated()
 
     assert mock_func.call_count == 1  # No retries
+
+
+def test_retry_with_backoff_delays(monkeypatch):
+    """Test backoff delays with and without jitter."""
+    sleeps = []
+    monkeypatch.setattr("claude_mm.retry.time.sleep", sleeps.append)
+
+    mock_func = Mock(side_effect=Exception("503 Service Unavailable"))
+    decorated = retry_with_backoff(max_attempts=4, initial_delay=1, max_delay=3, jitter=False)
+    with pytest.raises(Exception):
+        decorated(mock_func)()
+    assert sleeps == [1, 2, 3]
+
+    sleeps.clear()
+    decorated = retry_with_backoff(max_attempts=4, initial_delay=1, max_delay=3)
+    with pytest.raises(Exception):
+        decorated(mock_func)()
+    assert len(sleeps) == 3
+    assert all(1 <= s <= 3 for s in sleeps)
+
+
+def test_retry_with_backoff_honors_retry_after(monkeypatch):
+    """Test a server-requested Retry-After replaces the computed delay."""
+    sleeps = []
+    monkeypatch.setattr("claude_mm.retry.time.sleep", sleeps.append)
+
+    mock_func = Mock(side_effect=[Exception("429 rate limit, Retry-After: 7"), "success"])
+    decorated = retry_with_backoff(max_attempts=3, initial_delay=0.01)(mock_func)
+
+    assert decorated() == "success"
+    assert sleeps == [7.0]
+
+
+def test_retry_with_backoff_classifies_by_status_code(monkeypatch):
+    """Test errors carrying a status code are classified without their message."""
+    monkeypatch.setattr("claude_mm.retry.time.sleep", lambda _: None)
+
+    class StatusError(Exception):
+        def __init__(self, message, status_code):
+            super().__init__(message)
+            self.status_code = status_code
+
+    # The message would match the auth pattern, but a 503 is retryable
+    mock_func = Mock(side_effect=[StatusError("invalid upstream reply", 503), "success"])
+    assert retry_with_backoff(max_attempts=3)(mock_func)() == "success"
+    assert mock_func.call_count == 2
+
+    # A 403 wrapped in another error isn't retried
+    def wrapped():
+        try:
+            raise StatusError("forbidden", 403)
+        except StatusError as e:
+            raise RuntimeError(f"API error: {e}")
+
+    mock_func = Mock(side_effect=wrapped)
+    with pytest.raises(RuntimeError):
+        retry_with_backoff(max_attempts=3)(mock_func)()
+    assert mock_func.call_count == 1
+
+
+def test_retry_with_backoff_retryable_types(monkeypatch):
+    """Test retryable exception types are retried whatever their message."""
+    monkeypatch.setattr("claude_mm.retry.time.sleep", lambda _: None)
+
+    mock_func = Mock(side_effect=[ConnectionError("invalid connection state"), "success"])
+    assert retry_with_backoff(max_attempts=3)(mock_func)() == "success"
+    assert mock_func.call_count == 2
+
+
+def test_retry_with_backoff_caps_retry_after(monkeypatch):
+    """Test a Retry-After longer than max_delay is capped at max_delay."""
+    sleeps = []
+    monkeypatch.setattr("claude_mm.retry.time.sleep", sleeps.append)
+
+    class RateLimitError(Exception):
+        status_code = 429
+        response = Mock(headers={"retry-after": "3600"})
+
+    mock_func = Mock(side_effect=[RateLimitError("rate limited"), "success"])
+    decorated = retry_with_backoff(max_attempts=3, initial_delay=0.01, max_delay=10)(mock_func)
+
+    assert decorated() == "success"
+    assert sleeps == [10]
@@ -0,0 +1,155 @@
+"""Unit tests for usage module."""
+
+import json
+import logging
+import os
+import time
+
+import pytest
+
+from claude_mm import usage
+from claude_mm.usage import (
+    flush_log,
+    get_cost_log_path,
+    get_summary_path,
+    get_usage_stats,
+    log_api_call,
+)
+
+
+@pytest.fixture
+def temp_home(monkeypatch, tmp_path):
+    """Use a temporary home for the cost log during tests."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+
+def _log(model, cost, operation="review"):
+    """Log a call with fixed token counts."""
+    log_api_call(model, input_tokens=100, output_tokens=50, cost=cost, operation=operation)
+
+
+def _log_lines():
+    """Entries currently written to the cost log."""
+    log_path = get_cost_log_path()
+    if not log_path.exists():
+        return []
+    return [json.loads(line) for line in log_path.read_text().splitlines()]
+
+
+def test_flush_log_drains_queue(temp_home, monkeypatch):
+    """Test flush_log writes every queued entry, even with no writer thread started."""
+    monkeypatch.setattr(usage, "_ensure_writer", lambda: None)
+
+    for i in range(250):  # More than one batch
+        _log("gpt-5.2", 0.001 * i)
+
+    flush_log()
+
+    assert usage._LOG_QUEUE.qsize() == 0
+    entries = _log_lines()
+    assert len(entries) == 250
+    assert entries[-1]["cost"] == 0.249
+
+
+def test_background_writer_appends_entries(temp_home):
+    """Test queued entries are written by the background thread without a flush."""
+    _log("gpt-5.2", 0.01)
+    _log("claude", 0.02)
+    assert usage._writer_thread.is_alive()
+
+    deadline = time.monotonic() + 5
+    while len(_log_lines()) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert [entry["model"] for entry in _log_lines()] == ["gpt-5.2", "claude"]
+
+
+def test_write_failure_logged(temp_home, monkeypatch, caplog):
+    """Test a failed write is reported through logging and still drains the queue."""
+    monkeypatch.setattr(usage, "_ensure_writer", lambda: None)
+    monkeypatch.setattr(usage, "get_cost_log_path", lambda: temp_home / "missing" / "c.jsonl")
+    _log("gpt-5.2", 0.01)
+
+    with caplog.at_level(logging.WARNING, logger="claude_mm.usage"):
+        flush_log()
+
+    assert "Failed to log cost" in caplog.text
+    assert usage._LOG_QUEUE.qsize() == 0
+
+
+def test_summary_snapshot_appends(temp_home):
+    """Test all-time stats pick up entries appended after the snapshot was saved."""
+    _log("gpt-5.2", 0.01)
+    _log("gemini", 0.02, "plan")
+
+    stats = get_usage_stats()
+    assert stats["total_calls"] == 2
+    assert stats["total_cost"] == pytest.approx(0.03)
+
+    snapshot = json.loads(get_summary_path().read_text())
+    assert snapshot["offset"] == get_cost_log_path().stat().st_size
+
+    _log("gpt-5.2", 0.04)
+    stats = get_usage_stats()
+    assert stats["total_calls"] == 3
+    assert stats["by_model"]["gpt-5.2"] == {"cost": pytest.approx(0.05), "calls": 2}
+    assert stats["by_operation"]["plan"]["calls"] == 1
+
+
+def test_summary_snapshot_used_for_old_entries(temp_home):
+    """Test entries covered by the snapshot aren't parsed again."""
+    _log("gpt-5.2", 0.01)
+    get_usage_stats()
+
+    # Doctor the snapshot: if it's trusted, its totals show up in the stats
+    snapshot = json.loads(get_summary_path().read_text())
+    snapshot["totals"]["total_calls"] = 41
+    get_summary_path().write_text(json.dumps(snapshot))
+
+    _log("gpt-5.2", 0.01)
+    assert get_usage_stats()["total_calls"] == 42
+
+
+def test_summary_snapshot_ignored_after_truncation(temp_home):
+    """Test a truncated log is rescanned from the start."""
+    _log("gpt-5.2", 0.01)
+    _log("gpt-5.2", 0.01)
+    get_usage_stats()
+
+    get_cost_log_path().write_text("")
+    _log("claude", 0.5)
+
+    stats = get_usage_stats()
+    assert stats["total_calls"] == 1
+    assert list(stats["by_model"]) == ["claude"]
+
+
+def test_summary_snapshot_ignored_after_inode_replacement(temp_home):
+    """Test a log replaced by another file (e.g. rotation) is rescanned from the start."""
+    _log("gpt-5.2", 0.01)
+    _log("gpt-5.2", 0.01)
+    get_usage_stats()
+
+    log_path = get_cost_log_path()
+    lines = log_path.read_text().splitlines(keepends=True)
+    replacement = log_path.with_name("costs.new")
+    replacement.write_text("".join(lines * 2))
+    os.replace(replacement, log_path)
+
+    assert get_usage_stats()["total_calls"] == 4
+
+
+@pytest.mark.parametrize("contents", ["not json", "[1]", '{"offset": 3}'])
+def test_corrupt_summary_snapshot(temp_home, contents):
+    """Test an unreadable snapshot is ignored and rewritten."""
+    _log("gpt-5.2", 0.01)
+    _log("gpt-5.2", 0.02)
+    get_usage_stats()
+
+    get_summary_path().write_text(contents)
+
+    stats = get_usage_stats()
+    assert stats["total_calls"] == 2
+    assert stats["total_cost"] == pytest.approx(0.03)
+    assert json.loads(get_summary_path().read_text())["totals"]["total_calls"] == 2